@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, List, Sequence
+from typing import Dict, List, Optional, Sequence
 
 import numpy as np
 
 from ..core.game import GameState
+from .simulation import REAL_CLOCK, Clock, LatencyModel
 
 
 @dataclass
@@ -23,9 +23,13 @@ class InferenceResult:
 class PolicyValueModel(ABC):
     name: str = "base"
 
-    def __init__(self, backend: str) -> None:
+    def __init__(
+        self, backend: str, clock: Optional[Clock] = None, rng: Optional[np.random.Generator] = None
+    ) -> None:
         self.backend = backend
         self.loaded = False
+        self.clock = clock or REAL_CLOCK
+        self.rng = rng or np.random.default_rng()
 
     def ensure_loaded(self) -> None:
         if not self.loaded:
@@ -38,13 +42,16 @@ class PolicyValueModel(ABC):
 
     def infer(self, game: GameState) -> InferenceResult:
         self.ensure_loaded()
-        start = time.perf_counter()
+        start = self.clock.now()
         policy, value, extras = self._infer_impl(game)
-        latency_ms = (time.perf_counter() - start) * 1000.0
+        latency_ms = (self.clock.now() - start) * 1000.0
         return InferenceResult(
             policy=policy, value=value, latency_ms=latency_ms, backend=self.backend, model=self.name, extras=extras
         )
 
+    def _wait(self, latency: LatencyModel) -> None:
+        self.clock.sleep(latency.sample(self.rng))
+
     @abstractmethod
     def _infer_impl(self, game: GameState) -> tuple[List[float], float, Dict[str, float]]:
         ...
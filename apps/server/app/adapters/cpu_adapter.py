@@ -1,19 +1,25 @@
 from __future__ import annotations
 
-import time
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import numpy as np
 
 from .base import PolicyValueModel, softmax_masked
+from .simulation import Clock, LatencyModel, UniformLatency
 from ..core.game import COLS, GameState, ROWS
 
 
 class HeuristicCpuModel(PolicyValueModel):
     name = "heuristic-cpu"
 
-    def __init__(self) -> None:
-        super().__init__(backend="cpu")
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        clock: Optional[Clock] = None,
+        rng: Optional[np.random.Generator] = None,
+    ) -> None:
+        super().__init__(backend="cpu", clock=clock, rng=rng)
+        self._latency = latency or UniformLatency(0.035, 0.045)
 
     def load(self) -> None:
         # Nothing to load for heuristic model, but keep consistent interface.
@@ -27,7 +33,7 @@ class HeuristicCpuModel(PolicyValueModel):
                 continue
             scores[column] = self._score_column(game, column)
         # Simulate slower CPU-bound inference by accounting for vectorized compute.
-        time.sleep(0.035 + np.random.random() * 0.01)
+        self._wait(self._latency)
         policy = softmax_masked(scores, legal)
         value_estimate = self._estimate_value(game)
         extras: Dict[str, float] = {
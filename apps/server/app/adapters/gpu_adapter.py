@@ -1,40 +1,50 @@
 from __future__ import annotations
 
-import time
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import numpy as np
 
 from .base import PolicyValueModel, softmax_masked
 from ..core.game import COLS, GameState
 from .cpu_adapter import HeuristicCpuModel
+from .simulation import Clock, LatencyModel, UniformLatency
 
 
 class SimulatedGpuModel(PolicyValueModel):
     name = "sim-gpu"
 
-    def __init__(self, warmup_delay: float = 0.001) -> None:
-        super().__init__(backend="gpu")
-        self._cpu_delegate = HeuristicCpuModel()
+    def __init__(
+        self,
+        warmup_delay: float = 0.001,
+        latency: Optional[LatencyModel] = None,
+        clock: Optional[Clock] = None,
+        rng: Optional[np.random.Generator] = None,
+        delegate_latency: Optional[LatencyModel] = None,
+    ) -> None:
+        super().__init__(backend="gpu", clock=clock, rng=rng)
+        self._cpu_delegate = HeuristicCpuModel(
+            latency=delegate_latency, clock=self.clock, rng=self.rng
+        )
         self._warmup_delay = warmup_delay
+        self._latency = latency or UniformLatency(0.008, 0.012)
         self._invocations = 0
 
     def load(self) -> None:
         # Emulate CUDA context spin-up cost just once.
-        time.sleep(self._warmup_delay)
+        self.clock.sleep(self._warmup_delay)
 
     def _infer_impl(self, game: GameState) -> tuple[List[float], float, Dict[str, float]]:
         self._invocations += 1
         # Simulate kernel execution latency trending lower after warmup.
-        time.sleep(0.008 + np.random.random() * 0.004)
+        self._wait(self._latency)
         base = self._cpu_delegate._infer_impl(game)  # pylint: disable=protected-access
         policy, value, extras = base
-        jitter = np.random.default_rng().normal(0, 0.005, size=len(policy))
+        jitter = self.rng.normal(0, 0.005, size=len(policy))
         policy = softmax_masked(np.array(policy) + jitter, range(COLS))
         extras = {
             **extras,
             "gpu_warm": float(self._invocations > 1),
-            "simulated_power_w": 70.0 + 5.0 * np.random.random(),
+            "simulated_power_w": 70.0 + 5.0 * self.rng.random(),
         }
         return policy, value, extras
 
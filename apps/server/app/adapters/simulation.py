@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Protocol, Sequence
+
+import numpy as np
+
+
+class Clock(Protocol):
+    def now(self) -> float:
+        ...
+
+    def sleep(self, seconds: float) -> None:
+        ...
+
+
+class RealClock:
+    """Wall clock used outside simulation mode."""
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    """Clock that advances instantly instead of sleeping.
+
+    Each thread keeps its own timeline so that concurrent inferences do not inflate each
+    other's measured latency; ``advanced`` is the total simulated time across all threads.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._advanced = 0.0
+
+    def now(self) -> float:
+        return getattr(self._local, "now", 0.0)
+
+    def sleep(self, seconds: float) -> None:
+        self._local.now = self.now() + seconds
+        with self._lock:
+            self._advanced += seconds
+
+    @property
+    def advanced(self) -> float:
+        with self._lock:
+            return self._advanced
+
+
+REAL_CLOCK = RealClock()
+
+
+class LatencyModel(Protocol):
+    def sample(self, rng: np.random.Generator) -> float:
+        """Return a latency in seconds."""
+        ...
+
+
+@dataclass
+class ConstantLatency:
+    seconds: float = 0.0
+
+    def sample(self, rng: np.random.Generator) -> float:
+        return self.seconds
+
+
+@dataclass
+class UniformLatency:
+    low: float
+    high: float
+
+    def sample(self, rng: np.random.Generator) -> float:
+        return self.low + rng.random() * (self.high - self.low)
+
+
+@dataclass
+class LogNormalLatency:
+    median: float
+    sigma: float = 0.25
+
+    def sample(self, rng: np.random.Generator) -> float:
+        return float(self.median * np.exp(rng.normal(0.0, self.sigma)))
+
+
+class EmpiricalLatency:
+    """Resamples latencies observed in a recorded run."""
+
+    def __init__(self, samples_ms: Sequence[float]) -> None:
+        if not samples_ms:
+            raise ValueError("EmpiricalLatency needs at least one sample")
+        self._samples = np.asarray(samples_ms, dtype=np.float64) / 1000.0
+
+    def sample(self, rng: np.random.Generator) -> float:
+        return float(self._samples[rng.integers(len(self._samples))])
+
+
+PARAMETRIC_LATENCIES = {
+    "constant": ConstantLatency,
+    "uniform": UniformLatency,
+    "lognormal": LogNormalLatency,
+}
+
+
+def load_latency_profile(path: Path) -> Dict[str, LatencyModel]:
+    """Load per-backend latency models from a profile file.
+
+    ``*.ndjson`` files are treated as recorded telemetry and fitted empirically per backend.
+    Anything else is read as JSON of the form
+    ``{"gpu": {"kind": "lognormal", "median": 0.01, "sigma": 0.3}}`` with values in seconds.
+    """
+    if path.suffix == ".ndjson":
+        return fit_latency_profile(path)
+    spec = json.loads(path.read_text(encoding="utf-8"))
+    models: Dict[str, LatencyModel] = {}
+    for backend, params in spec.items():
+        params = dict(params)
+        kind = params.pop("kind")
+        if kind not in PARAMETRIC_LATENCIES:
+            raise ValueError(f"Unknown latency kind '{kind}' for backend '{backend}'")
+        models[backend] = PARAMETRIC_LATENCIES[kind](**params)
+    return models
+
+
+def fit_latency_profile(path: Path) -> Dict[str, LatencyModel]:
+    """Fit one empirical latency distribution per backend from a ``telemetry.ndjson`` file."""
+    samples: Dict[str, List[float]] = {}
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "backend" in record and "latency_ms" in record and not record.get("ponder_hit"):
+                samples.setdefault(record["backend"], []).append(float(record["latency_ms"]))
+    return {backend: EmpiricalLatency(values) for backend, values in samples.items()}
+
+
+def backend_rng(seed: int, backend: str) -> np.random.Generator:
+    """Independent, reproducible generator per backend regardless of construction order."""
+    return np.random.default_rng([seed, zlib.crc32(backend.encode("utf-8"))])
+
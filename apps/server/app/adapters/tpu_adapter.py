@@ -1,30 +1,38 @@
 from __future__ import annotations
 
-import time
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import numpy as np
 
 from .base import PolicyValueModel, softmax_masked
 from ..core.game import COLS, GameState
 from .cpu_adapter import HeuristicCpuModel
+from .simulation import Clock, LatencyModel, UniformLatency
 
 
 class SimulatedTpuModel(PolicyValueModel):
     name = "sim-tpu"
 
-    def __init__(self, batch_size: int = 1) -> None:
-        super().__init__(backend="tpu")
-        self._delegate = HeuristicCpuModel()
+    def __init__(
+        self,
+        batch_size: int = 1,
+        latency: Optional[LatencyModel] = None,
+        clock: Optional[Clock] = None,
+        rng: Optional[np.random.Generator] = None,
+        delegate_latency: Optional[LatencyModel] = None,
+    ) -> None:
+        super().__init__(backend="tpu", clock=clock, rng=rng)
+        self._delegate = HeuristicCpuModel(latency=delegate_latency, clock=self.clock, rng=self.rng)
         self._batch_size = batch_size
+        self._latency = latency or UniformLatency(0.015, 0.020)
 
     def load(self) -> None:
         # TPU compilation emulator.
-        time.sleep(0.05)
+        self.clock.sleep(0.05)
 
     def _infer_impl(self, game: GameState) -> tuple[List[float], float, Dict[str, float]]:
         # Pretend to batch by repeating state and averaging.
-        time.sleep(0.015 + np.random.random() * 0.005)
+        self._wait(self._latency)
         legal = game.legal_moves()
         base_policy = np.zeros(COLS, dtype=np.float32)
         base_value = 0.0
@@ -34,12 +42,12 @@ class SimulatedTpuModel(PolicyValueModel):
             base_value += value
         base_policy /= max(1, self._batch_size)
         base_value /= max(1, self._batch_size)
-        noise = np.random.default_rng().normal(0, 0.01, size=COLS)
+        noise = self.rng.normal(0, 0.01, size=COLS)
         policy = softmax_masked(base_policy + noise, legal)
         extras = {
             **extras,
             "batched": float(self._batch_size),
-            "simulated_power_w": 40.0 + 10.0 * np.random.random(),
+            "simulated_power_w": 40.0 + 10.0 * self.rng.random(),
         }
         return policy, base_value, extras
 
@@ -1,19 +1,81 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Dict, List, Literal, Optional
+import hmac
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Literal, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import (
+    APIRouter,
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from loguru import logger
 from pydantic import BaseModel, Field
 
+from .adapters.base import InferenceResult, PolicyValueModel
 from .config import settings
+from .core.admission import AdmissionController, AdmissionRejectedError
+from .core.book import load_opening_book
 from .core.game import COLS, ROWS, GameState
+from .core.ponder import Ponderer
 from .core.registry import registry
-from .telemetry.metrics import MetricsStore, SubscriberSet
+from .core.routing import AUTO_BACKEND, LatencyRouter, RouteCandidate
+from .telemetry.metrics import MetricsStore, SubscriberSet, Subscription
+from .telemetry.profiler import (
+    PROFILE_FORMATS,
+    AllocationTracker,
+    ProfilerBusyError,
+    SamplingProfiler,
+    backend_marker,
+)
+from .telemetry.trace import TraceRecorder
+
+metrics_store = MetricsStore(max_records=settings.metrics_window, log_path=settings.telemetry_log_path)
+subscribers = SubscriberSet()
+tracer = TraceRecorder(settings.trace_path, sample_rate=settings.trace_sample_rate)
+admission = AdmissionController(
+    metrics_store,
+    max_inflight=settings.admission_max_inflight,
+    max_queue=settings.admission_max_queue,
+)
+opening_book = load_opening_book(settings.opening_book_path)
+router = LatencyRouter(metrics_store, admission, policy=settings.routing_policy)
+profiler = SamplingProfiler()
+allocations = AllocationTracker()
+ponderer = Ponderer(
+    registry,
+    metrics_store,
+    enabled=settings.ponder_enabled,
+    workers=settings.ponder_workers,
+    depth=settings.ponder_depth,
+    queue_depth=settings.ponder_queue_depth,
+    cache_size=settings.ponder_cache_size,
+)
 
-app = FastAPI(default_response_class=JSONResponse, title="AI Game Benchmark API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    ponderer.shutdown()
+
+
+app = FastAPI(
+    default_response_class=JSONResponse,
+    title="AI Game Benchmark API",
+    version="0.1.0",
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,14 +85,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-metrics_store = MetricsStore(max_records=settings.metrics_window, log_path=settings.telemetry_log_path)
-subscribers = SubscriberSet()
-
 
 class InferRequest(BaseModel):
     board: List[List[int]] = Field(..., description="6x7 board with -1, 0, 1 values")
     current_player: Literal[-1, 1] = Field(1, description="Player to move (1 or -1)")
-    backend: Optional[str] = Field(None, description="cpu | gpu | tpu")
+    backend: Optional[str] = Field(None, description="cpu | gpu | tpu | auto")
+    deadline_ms: Optional[float] = Field(
+        None, gt=0, description="Drop the request if it cannot start within this many ms of arrival"
+    )
 
     def to_game(self) -> GameState:
         return GameState.from_list(self.board, self.current_player)
@@ -66,6 +128,7 @@ class SummaryBuckets(BaseModel):
 class MetricsSummaryResponse(BaseModel):
     overall: SummaryBuckets
     by_backend: Dict[str, SummaryBuckets]
+    counters: Dict[str, Dict[str, float]] = Field(default_factory=dict)
 
 
 @app.get("/health")
@@ -75,23 +138,190 @@ async def health() -> Dict[str, str]:
 
 @app.get("/backends", response_model=List[BackendInfo])
 async def available_backends() -> List[BackendInfo]:
-    return [BackendInfo(key=key, name=name) for key, name in registry.available().items()]
+    backends = [BackendInfo(key=key, name=name) for key, name in registry.available().items()]
+    return [*backends, BackendInfo(key=AUTO_BACKEND, name=f"auto ({router.policy})")]
+
+
+def _run_inference(model: PolicyValueModel, backend_key: str, game: GameState) -> InferenceResult:
+    with backend_marker(backend_key), ponderer.real_request():
+        result = ponderer.lookup(backend_key, game)
+        if result is None:
+            result = model.infer(game)
+            if ponderer.enabled:
+                result.extras = {**result.extras, "ponder_hit": 0.0}
+    ponderer.schedule(backend_key, game, result.policy)
+    return result
+
+
+def _from_book(backend_key: str, game: GameState) -> Optional[InferenceResult]:
+    if opening_book is None:
+        return None
+    start = time.perf_counter()
+    entry = opening_book.lookup(game)
+    if entry is None:
+        return None
+    policy, value = entry
+    metrics_store.increment(backend_key, "book_hits")
+    return InferenceResult(
+        policy=policy,
+        value=value,
+        latency_ms=(time.perf_counter() - start) * 1000.0,
+        backend="book",
+        model=f"book:{opening_book.model}",
+        extras={"book_hit": 1.0, "fanout": float(len(game.legal_moves()))},
+    )
+
+
+async def _infer_on(
+    backend_key: str,
+    game: GameState,
+    deadline_ms: Optional[float],
+    admitted: Optional[asyncio.Event] = None,
+) -> Tuple[InferenceResult, float]:
+    model = registry.get(backend_key)
+    async with admission.admit(backend_key, deadline_ms) as queue_ms:
+        if admitted is not None:
+            admitted.set()
+        result = await asyncio.to_thread(_run_inference, model, backend_key, game)
+    return result, queue_ms
+
+
+async def _first_success(tasks: Dict[asyncio.Task, asyncio.Event]) -> asyncio.Task:
+    pending = set(tasks)
+    failed: List[asyncio.Task] = []
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is None:
+                queued = [straggler for straggler in pending if not tasks[straggler].is_set()]
+                for straggler in pending:
+                    if tasks[straggler].is_set():
+                        # Admitted losers keep their slot until the model call returns, since
+                        # the worker thread cannot be interrupted.
+                        straggler.add_done_callback(lambda t: t.cancelled() or t.exception())
+                    else:
+                        straggler.cancel()
+                await asyncio.gather(*queued, return_exceptions=True)
+                return task
+            failed.append(task)
+    raise failed[0].exception()
+
+
+async def _infer_with_failover(
+    candidates: List[RouteCandidate],
+    game: GameState,
+    deadline_ms: Optional[float],
+    admitted: asyncio.Event,
+    tried: List[str],
+) -> Tuple[InferenceResult, float]:
+    # A full queue rejects before any waiting, so falling through to the next candidate costs
+    # nothing; only the last candidate's 429 reaches the client.
+    for index, candidate in enumerate(candidates):
+        tried.append(candidate.backend)
+        try:
+            return await _infer_on(candidate.backend, game, deadline_ms, admitted)
+        except AdmissionRejectedError as exc:
+            if exc.status_code != 429 or index == len(candidates) - 1:
+                raise
+            metrics_store.increment(candidate.backend, "route_failovers")
+    raise RuntimeError("No backends to route to")
+
+
+async def _infer_auto(
+    game: GameState, deadline_ms: Optional[float]
+) -> Tuple[InferenceResult, float]:
+    start = time.perf_counter()
+    candidates = router.rank(registry.available())
+    primary = candidates[0]
+    extras: Dict[str, float] = {
+        "route_auto": 1.0,
+        "route_score": primary.score,
+        "route_candidates": float(len(candidates)),
+        "hedged": 0.0,
+        "hedge_won": 0.0,
+    }
+    metrics_store.increment(primary.backend, "routed")
+    tried: List[str] = []
+    primary_admitted = asyncio.Event()
+    primary_task = asyncio.create_task(
+        _infer_with_failover(candidates, game, deadline_ms, primary_admitted, tried)
+    )
+    tasks = {primary_task: primary_admitted}
+    if settings.hedge_enabled and len(candidates) > 1 and primary.p95 > 0:
+        done, _ = await asyncio.wait(tasks, timeout=primary.p95 / 1000.0)
+        # The hedge inherits whatever is left of the client's deadline, not a fresh one.
+        remaining_ms = deadline_ms
+        if deadline_ms is not None:
+            remaining_ms = deadline_ms - (time.perf_counter() - start) * 1000.0
+        untried = [candidate for candidate in candidates if candidate.backend not in tried]
+        if not done and untried and (remaining_ms is None or remaining_ms > 0):
+            secondary = untried[0]
+            secondary_admitted = asyncio.Event()
+            secondary_task = asyncio.create_task(
+                _infer_on(secondary.backend, game, remaining_ms, secondary_admitted)
+            )
+            tasks[secondary_task] = secondary_admitted
+            extras["hedged"] = 1.0
+            metrics_store.increment(secondary.backend, "hedges_fired")
+    winner = await _first_success(tasks)
+    result, queue_ms = winner.result()
+    if winner is not primary_task:
+        extras["hedge_won"] = 1.0
+        metrics_store.increment(result.backend, "hedges_won")
+    extras["route_failovers"] = float(len(tried) - 1)
+    result.extras = {**result.extras, **extras}
+    return result, queue_ms
 
 
 @app.post("/infer", response_model=InferResponse)
 async def infer(request: InferRequest) -> InferResponse:
+    arrival_ts = time.time()
+    traced = tracer.sampled()
     backend_key = (request.backend or settings.default_backend).lower()
-    try:
-        model = registry.get(backend_key)
-    except KeyError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if backend_key != AUTO_BACKEND:
+        try:
+            registry.get(backend_key)
+        except KeyError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
     game = request.to_game()
     if len(game.board) != ROWS or len(game.board[0]) != COLS:
         raise HTTPException(status_code=400, detail="Board must be 6x7")
     if not game.legal_moves():
         raise HTTPException(status_code=400, detail="No legal moves available")
 
-    result = model.infer(game)
+    # Book hits never touch a backend, so they skip admission control as well.
+    result = _from_book(backend_key, game)
+    queue_ms = 0.0
+    if result is None:
+        try:
+            if backend_key == AUTO_BACKEND:
+                result, queue_ms = await _infer_auto(game, request.deadline_ms)
+            else:
+                result, queue_ms = await _infer_on(backend_key, game, request.deadline_ms)
+        except AdmissionRejectedError as exc:
+            if traced:
+                tracer.record(
+                    arrival_ts,
+                    backend_key,
+                    game,
+                    status=exc.status_code,
+                    deadline_ms=request.deadline_ms,
+                )
+            raise HTTPException(
+                status_code=exc.status_code,
+                detail=exc.detail,
+                headers={"Retry-After": str(exc.retry_after)},
+            ) from exc
+    result.extras = {**result.extras, "queue_ms": queue_ms}
+    if traced:
+        tracer.record(
+            arrival_ts,
+            backend_key,
+            game,
+            deadline_ms=request.deadline_ms,
+            queue_ms=queue_ms,
+            latency_ms=result.latency_ms,
+        )
     record = {
         "backend": result.backend,
         "latency_ms": result.latency_ms,
@@ -117,12 +347,119 @@ async def metrics_summary() -> MetricsSummaryResponse:
     return MetricsSummaryResponse.model_validate(data)
 
 
+async def _send_aggregates(websocket: WebSocket, subscription: Subscription) -> None:
+    last_tick = time.monotonic()
+    while True:
+        await asyncio.sleep(subscription.interval)
+        if subscription.mode != "aggregate":
+            return
+        now = time.monotonic()
+        try:
+            payload = {
+                "type": "aggregate",
+                "ts": time.time(),
+                "interval_s": now - last_tick,
+                **subscription.aggregate.flush(),
+                "summary": metrics_store.summarize_all(),
+            }
+        except Exception as exc:  # pragma: no cover - keep the ticker alive for this subscriber
+            logger.warning("Failed to build telemetry aggregate: {}", exc)
+            continue
+        last_tick = now
+        try:
+            await websocket.send_json(payload)
+        except Exception:
+            return
+
+
 @app.websocket("/ws/telemetry")
 async def telemetry_stream(websocket: WebSocket) -> None:
+    """Query params or a later ``{"type": "subscribe"}`` message set the ``Subscription``."""
+    try:
+        subscription = Subscription.from_options(websocket.query_params)
+    except ValueError:
+        await websocket.close(code=1008)
+        return
     await websocket.accept()
-    await subscribers.register(websocket)
+    await subscribers.register(websocket, subscription)
+    ticker: Optional[asyncio.Task] = None
     try:
         while True:
-            await asyncio.sleep(10)
+            # Only aggregate subscribers need a ticker; it exits on its own after a switch away.
+            if subscription.mode == "aggregate" and (ticker is None or ticker.done()):
+                ticker = asyncio.create_task(_send_aggregates(websocket, subscription))
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+                if message.get("type") == "subscribe":
+                    subscription.update(message)
+            except (ValueError, TypeError, AttributeError) as exc:
+                await websocket.send_json({"type": "error", "detail": str(exc)})
     except WebSocketDisconnect:
+        pass
+    finally:
+        if ticker is not None:
+            ticker.cancel()
         await subscribers.unregister(websocket)
+
+
+LOOPBACK_HOSTS = ("127.0.0.1", "::1", "localhost")
+
+
+def _require_admin(request: Request, x_admin_token: Optional[str] = Header(None)) -> None:
+    # Hide the admin surface entirely rather than advertising it with 403s.
+    if not settings.debug_mode:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.admin_token:
+        if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.admin_token):
+            raise HTTPException(status_code=401, detail="Admin token required")
+        return
+    # Without a token only the host itself may profile the process.
+    if request.client is None or request.client.host not in LOOPBACK_HOSTS:
+        raise HTTPException(status_code=403, detail="Debug endpoints are loopback-only")
+
+
+debug_router = APIRouter(prefix="/debug", dependencies=[Depends(_require_admin)])
+
+
+@debug_router.post("/profile")
+async def profile_process(
+    seconds: float = Query(5.0, gt=0, le=60),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    backend: Optional[str] = None,
+    output: str = Query("speedscope", alias="format"),
+) -> Response:
+    if output not in PROFILE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {PROFILE_FORMATS}")
+    if backend is not None and backend not in registry.available():
+        raise HTTPException(status_code=400, detail=f"Unknown backend '{backend}'")
+    try:
+        profile = await asyncio.to_thread(profiler.run, seconds, interval_ms / 1000.0, backend)
+    except ProfilerBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    if output == "collapsed":
+        return PlainTextResponse(profile.collapsed())
+    return JSONResponse(profile.speedscope())
+
+
+@debug_router.post("/allocations/start")
+async def start_allocations(frames: int = Query(16, ge=1, le=64)) -> Dict[str, bool]:
+    allocations.start(frames)
+    return {"tracking": True}
+
+
+@debug_router.get("/allocations")
+async def allocation_snapshot(limit: int = Query(20, ge=1, le=200)) -> Dict:
+    try:
+        return allocations.snapshot(limit)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
+@debug_router.delete("/allocations")
+async def stop_allocations() -> Dict[str, bool]:
+    allocations.stop()
+    return {"tracking": False}
+
+
+app.include_router(debug_router)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,6 +12,22 @@ class Settings(BaseSettings):
     metrics_window: int = 512
     default_backend: str = "cpu"
     debug_mode: bool = False
+    admin_token: Optional[str] = None
+    admission_max_inflight: int = 4
+    admission_max_queue: int = 16
+    routing_policy: str = "expected_completion"
+    hedge_enabled: bool = False
+    simulation_mode: bool = False
+    simulation_seed: int = 0
+    simulation_profile: Optional[Path] = None
+    opening_book_path: Optional[Path] = None
+    trace_path: Optional[Path] = None
+    trace_sample_rate: float = 1.0
+    ponder_enabled: bool = False
+    ponder_workers: int = 1
+    ponder_depth: int = 2
+    ponder_queue_depth: int = 64
+    ponder_cache_size: int = 1024
 
     model_config = SettingsConfigDict(env_prefix="AIGB_", env_file=".env", case_sensitive=False)
 
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from ..telemetry.metrics import MetricsStore
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request is shed instead of being queued for a backend."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class _BackendGate:
+    """FIFO slot gate for one backend. Only touched from the event loop thread."""
+
+    def __init__(self, max_inflight: int, max_queue: int) -> None:
+        self.max_inflight = max(1, max_inflight)
+        self.max_queue = max(0, max_queue)
+        self.inflight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.service_ms = 0.0
+
+    @property
+    def queued(self) -> int:
+        return len(self.waiters)
+
+    def release(self) -> None:
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the next waiter; inflight stays unchanged.
+                waiter.set_result(None)
+                return
+        self.inflight -= 1
+
+    def record_service(self, elapsed_ms: float, alpha: float = 0.2) -> None:
+        if self.service_ms == 0.0:
+            self.service_ms = elapsed_ms
+        else:
+            self.service_ms = (1 - alpha) * self.service_ms + alpha * elapsed_ms
+
+    def retry_after(self) -> int:
+        backlog = (self.queued + 1) / self.max_inflight
+        return max(1, math.ceil(backlog * self.service_ms / 1000.0))
+
+
+class AdmissionController:
+    """Per-backend admission control with bounded queues and deadline-aware shedding.
+
+    Each backend admits at most ``max_inflight`` concurrent requests and parks at most
+    ``max_queue`` more in FIFO order. Requests beyond that are rejected immediately with
+    429, and queued requests whose deadline passes before a slot frees up are dropped with
+    503 without ever reaching the model.
+    """
+
+    def __init__(self, metrics: MetricsStore, max_inflight: int = 4, max_queue: int = 16) -> None:
+        self._metrics = metrics
+        self._max_inflight = max_inflight
+        self._max_queue = max_queue
+        self._gates: Dict[str, _BackendGate] = {}
+
+    def load(self, backend: str) -> Dict[str, int]:
+        gate = self._gate(backend)
+        return {"inflight": gate.inflight, "queued": gate.queued, "max_inflight": gate.max_inflight}
+
+    @asynccontextmanager
+    async def admit(
+        self, backend: str, deadline_ms: Optional[float] = None
+    ) -> AsyncIterator[float]:
+        """Hold a backend slot for the duration of the block, yielding the queue time in ms."""
+        arrival = time.perf_counter()
+        deadline = arrival + deadline_ms / 1000.0 if deadline_ms is not None else None
+        gate = self._gate(backend)
+        await self._acquire(gate, backend, deadline)
+        queue_ms = (time.perf_counter() - arrival) * 1000.0
+        if deadline is not None and time.perf_counter() >= deadline:
+            gate.release()
+            self._metrics.increment(backend, "shed_deadline")
+            raise AdmissionRejectedError(503, "Deadline expired while queued", gate.retry_after())
+        self._metrics.increment(backend, "admitted")
+        self._metrics.increment(backend, "queue_ms", queue_ms)
+        start = time.perf_counter()
+        try:
+            yield queue_ms
+        finally:
+            gate.record_service((time.perf_counter() - start) * 1000.0)
+            gate.release()
+
+    def _gate(self, backend: str) -> _BackendGate:
+        gate = self._gates.get(backend)
+        if gate is None:
+            gate = self._gates[backend] = _BackendGate(self._max_inflight, self._max_queue)
+        return gate
+
+    async def _acquire(self, gate: _BackendGate, backend: str, deadline: Optional[float]) -> None:
+        if gate.inflight < gate.max_inflight and not gate.waiters:
+            gate.inflight += 1
+            return
+        if gate.queued >= gate.max_queue:
+            self._metrics.increment(backend, "shed_queue_full")
+            raise AdmissionRejectedError(
+                429, f"Backend '{backend}' is saturated", gate.retry_after()
+            )
+        waiter = asyncio.get_running_loop().create_future()
+        gate.waiters.append(waiter)
+        timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+        try:
+            await asyncio.wait({waiter}, timeout=timeout)
+        except asyncio.CancelledError:
+            self._abandon(gate, waiter)
+            raise
+        if not waiter.done():
+            self._abandon(gate, waiter)
+            self._metrics.increment(backend, "shed_deadline")
+            raise AdmissionRejectedError(503, "Deadline expired while queued", gate.retry_after())
+
+    @staticmethod
+    def _abandon(gate: _BackendGate, waiter: asyncio.Future) -> None:
+        if waiter.done():
+            # The slot was handed over just as we gave up; pass it on.
+            gate.release()
+            return
+        waiter.cancel()
+        try:
+            gate.waiters.remove(waiter)
+        except ValueError:
+            pass
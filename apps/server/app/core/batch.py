@@ -0,0 +1,132 @@
+"""Vectorized Connect Four engine that advances many games per array operation.
+
+``GameBatch`` keeps N boards in one contiguous ``(capacity, ROWS, COLS)`` array so a
+self-play ply over thousands of games is a handful of numpy calls instead of a Python loop
+over ``GameState`` objects. Finished games are compacted out so the live games stay a dense
+prefix that batched adapters can consume directly through :meth:`GameBatch.encode_planes`.
+"""
+
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .game import COLS, ROWS, GameState
+
+
+class GameBatch:
+    """N independent games stored as contiguous arrays; rows ``[0, len(self))`` are live."""
+
+    def __init__(self, size: int) -> None:
+        if size < 0:
+            raise ValueError("size must be non-negative")
+        self._size = size
+        self._boards = np.zeros((size, ROWS, COLS), dtype=np.int8)
+        self._heights = np.zeros((size, COLS), dtype=np.int8)
+        self._players = np.ones(size, dtype=np.int8)
+        self._ids = np.arange(size, dtype=np.int64)
+        self._planes = np.zeros((size, 3, ROWS, COLS), dtype=np.float32)
+        self._rows = np.arange(size)
+
+    @classmethod
+    def from_states(cls, states: Sequence[GameState]) -> "GameBatch":
+        batch = cls(len(states))
+        for index, state in enumerate(states):
+            batch._boards[index] = state.board
+            batch._players[index] = state.current_player
+        batch._heights[:] = np.count_nonzero(batch._boards, axis=1)
+        return batch
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def boards(self) -> np.ndarray:
+        return self._boards[: self._size]
+
+    @property
+    def current_players(self) -> np.ndarray:
+        return self._players[: self._size]
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Original index of each live game, stable across :meth:`compact`."""
+        return self._ids[: self._size]
+
+    def state(self, index: int) -> GameState:
+        return GameState(board=self._boards[index].copy(), current_player=int(self._players[index]))
+
+    def legal_mask(self) -> np.ndarray:
+        return self._heights[: self._size] < ROWS
+
+    def drop_discs(self, columns: Sequence[int]) -> None:
+        """Play one move in every live game; ``columns[i]`` goes to game ``i``."""
+        columns = np.asarray(columns, dtype=np.intp)
+        if columns.shape != (self._size,):
+            raise ValueError(f"Expected {self._size} columns, got shape {columns.shape}")
+        if np.any((columns < 0) | (columns >= COLS)):
+            raise ValueError(f"Columns must be in [0, {COLS})")
+        games = self._rows[: self._size]
+        heights = self._heights[games, columns]
+        if np.any(heights >= ROWS):
+            raise ValueError("Cannot drop a disc into a full column")
+        self._boards[games, ROWS - 1 - heights, columns] = self._players[: self._size]
+        self._heights[games, columns] = heights + 1
+        self._players[: self._size] *= -1
+
+    def winners(self) -> np.ndarray:
+        """Per-game winner: 1, -1, or 0 while nobody has four in a row."""
+        b = self._boards[: self._size]
+        lines = (
+            b[:, :, 0:4] + b[:, :, 1:5] + b[:, :, 2:6] + b[:, :, 3:7],
+            b[:, 0:3] + b[:, 1:4] + b[:, 2:5] + b[:, 3:6],
+            b[:, 0:3, 0:4] + b[:, 1:4, 1:5] + b[:, 2:5, 2:6] + b[:, 3:6, 3:7],
+            b[:, 3:6, 0:4] + b[:, 2:5, 1:5] + b[:, 1:4, 2:6] + b[:, 0:3, 3:7],
+        )
+        first = np.zeros(self._size, dtype=bool)
+        second = np.zeros(self._size, dtype=bool)
+        for sums in lines:
+            flat = sums.reshape(self._size, -1)
+            first |= np.any(flat == 4, axis=1)
+            second |= np.any(flat == -4, axis=1)
+        return first.astype(np.int8) - second.astype(np.int8)
+
+    def finished(self) -> np.ndarray:
+        return (self.winners() != 0) | ~np.any(self.legal_mask(), axis=1)
+
+    def encode_planes(self) -> np.ndarray:
+        """``(len(self), 3, ROWS, COLS)`` planes matching ``GameState.encode_planes``.
+
+        The result is a view into a buffer owned by the batch and is overwritten by the next
+        call, so copy it if it has to outlive the ply.
+        """
+        planes = self._planes[: self._size]
+        boards = self._boards[: self._size]
+        players = self._players[: self._size, None, None]
+        np.equal(boards, players, out=planes[:, 0], casting="unsafe")
+        np.equal(boards, -players, out=planes[:, 1], casting="unsafe")
+        planes[:, 2] = players == 1
+        return planes
+
+    def compact(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Drop finished games, keeping live ones as a dense prefix in their original order.
+
+        Returns the ids and winners (0 for draws) of the games that were removed.
+        """
+        winners = self.winners()
+        done = (winners != 0) | ~np.any(self.legal_mask(), axis=1)
+        removed = (self._ids[: self._size][done].copy(), winners[done])
+        keep = np.flatnonzero(~done)
+        live = len(keep)
+        if live != self._size:
+            for array in (self._boards, self._heights, self._players, self._ids):
+                array[:live] = array[keep]
+            self._size = live
+        return removed
+
+    def states(self) -> List[GameState]:
+        return [self.state(index) for index in range(self._size)]
+
+
+__all__ = ["GameBatch"]
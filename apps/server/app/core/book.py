@@ -0,0 +1,171 @@
+"""Precomputed opening book stored as a sorted, memory-mapped binary table.
+
+Build:
+    python -m app.core.book --depth 6 --backend cpu --out bench/book/opening-book.bin
+
+Positions are canonicalized under left-right mirror symmetry and keyed by a 64-bit
+bitboard encoding, so lookups are a binary search over a memory-mapped key array that the
+OS shares across every worker process.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from ..adapters.base import PolicyValueModel
+from .game import COLS, ROWS, GameState
+from .registry import build_simulated_models
+
+BOOK_MAGIC = b"AIGBBOOK"
+BOOK_VERSION = 1
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("depth", "<u4"),
+        ("count", "<u8"),
+        ("backend", "S8"),
+        ("model", "S32"),
+    ]
+)
+HEADER_SIZE = 64
+ENTRY_DTYPE = np.dtype([("policy", "<f4", (COLS,)), ("value", "<f4")])
+
+# Bit (row, col) of the classic 7-bits-per-column layout; row 0 is the top of the board.
+_CELL_BITS = np.array(
+    [[1 << (col * (ROWS + 1) + (ROWS - 1 - row)) for col in range(COLS)] for row in range(ROWS)],
+    dtype=np.uint64,
+)
+_BOTTOM = sum(1 << (col * (ROWS + 1)) for col in range(COLS))
+
+
+def position_key(board: np.ndarray, current_player: int) -> Optional[int]:
+    """Unique key for a gravity-consistent board, or ``None`` if discs are floating."""
+    occupied = board != 0
+    if np.any(occupied[:-1] & ~occupied[1:]):
+        return None
+    mask = int(_CELL_BITS[occupied].sum(dtype=np.uint64))
+    first = int(_CELL_BITS[board == 1].sum(dtype=np.uint64))
+    return ((first + mask + _BOTTOM) << 1) | int(current_player == 1)
+
+
+def canonical_key(game: GameState) -> Optional[Tuple[int, bool]]:
+    """Smaller of the position and its mirror image, plus whether the mirror was taken."""
+    key = position_key(game.board, game.current_player)
+    if key is None:
+        return None
+    mirrored = position_key(game.board[:, ::-1], game.current_player)
+    return (mirrored, True) if mirrored < key else (key, False)
+
+
+def enumerate_positions(depth: int) -> Dict[int, GameState]:
+    """Canonical non-terminal positions within ``depth`` plies of the empty board."""
+    frontier = [GameState()]
+    positions: Dict[int, GameState] = {canonical_key(frontier[0])[0]: frontier[0]}
+    for _ in range(depth):
+        next_frontier: List[GameState] = []
+        for state in frontier:
+            for column in state.legal_moves():
+                child = state.clone()
+                child.drop_disc(column)
+                if child.winner() is not None or not child.legal_moves():
+                    continue
+                key, mirrored = canonical_key(child)
+                if key in positions:
+                    continue
+                if mirrored:
+                    child = GameState(child.board[:, ::-1].copy(), child.current_player)
+                positions[key] = child
+                next_frontier.append(child)
+        frontier = next_frontier
+    return positions
+
+
+def build_book(model: PolicyValueModel, depth: int, path: Path) -> int:
+    positions = enumerate_positions(depth)
+    keys = np.array(sorted(positions), dtype=np.uint64)
+    entries = np.zeros(len(keys), dtype=ENTRY_DTYPE)
+    for index, key in enumerate(keys.tolist()):
+        result = model.infer(positions[key])
+        entries[index]["policy"] = result.policy
+        entries[index]["value"] = result.value
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header[0] = (BOOK_MAGIC, BOOK_VERSION, depth, len(keys), model.backend, model.name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as fh:
+        fh.write(header.tobytes().ljust(HEADER_SIZE, b"\0"))
+        fh.write(keys.tobytes())
+        fh.write(entries.tobytes())
+    return len(keys)
+
+
+class OpeningBook:
+    """Read-only view over a book file built by :func:`build_book`."""
+
+    def __init__(self, path: Path) -> None:
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if len(header) != 1 or header[0]["magic"] != BOOK_MAGIC:
+            raise ValueError(f"{path} is not an opening book")
+        if header[0]["version"] != BOOK_VERSION:
+            raise ValueError(f"Unsupported opening book version {header[0]['version']}")
+        count = int(header[0]["count"])
+        self.depth = int(header[0]["depth"])
+        self.backend = header[0]["backend"].decode("utf-8")
+        self.model = header[0]["model"].decode("utf-8")
+        self._keys = np.memmap(path, dtype=np.uint64, mode="r", offset=HEADER_SIZE, shape=(count,))
+        self._entries = np.memmap(
+            path, dtype=ENTRY_DTYPE, mode="r", offset=HEADER_SIZE + 8 * count, shape=(count,)
+        )
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def lookup(self, game: GameState) -> Optional[Tuple[List[float], float]]:
+        canonical = canonical_key(game)
+        if canonical is None or not len(self._keys):
+            return None
+        key, mirrored = canonical
+        index = int(np.searchsorted(self._keys, np.uint64(key)))
+        if index >= len(self._keys) or int(self._keys[index]) != key:
+            return None
+        entry = self._entries[index]
+        policy = entry["policy"][::-1] if mirrored else entry["policy"]
+        return [float(p) for p in policy], float(entry["value"])
+
+
+def load_opening_book(path: Optional[Path]) -> Optional[OpeningBook]:
+    if path is None:
+        return None
+    try:
+        return OpeningBook(path)
+    except (OSError, ValueError) as exc:
+        logger.warning("Opening book disabled: {}", exc)
+        return None
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Build an opening book for AI Game Benchmark")
+    parser.add_argument("--depth", type=int, default=6, help="Maximum ply depth to enumerate")
+    parser.add_argument("--backend", default="cpu", help="Backend that fills the book")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the backend's noise")
+    parser.add_argument(
+        "--out", type=Path, default=Path("bench/book/opening-book.bin"), help="Output path"
+    )
+    return parser
+
+
+def main() -> None:
+    args = build_arg_parser().parse_args()
+    # Book contents do not depend on latency, so build on the virtual clock.
+    model = build_simulated_models(seed=args.seed)[args.backend]
+    count = build_book(model, args.depth, args.out)
+    print(f"Wrote {count} positions (depth {args.depth}, {model.name}) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
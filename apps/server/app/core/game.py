@@ -27,6 +27,29 @@ class GameState:
             raise ValueError("current_player must be 1 or -1")
         return cls(board=array, current_player=current_player)
 
+    @classmethod
+    def from_key(cls, key: int) -> "GameState":
+        player = 1 if key & 1 else -1
+        cells = ROWS * COLS
+        second_bits = (key >> 1) & ((1 << cells) - 1)
+        first_bits = key >> (cells + 1)
+        board = np.zeros(ROWS * COLS, dtype=np.int8)
+        for idx in range(cells):
+            if first_bits >> idx & 1:
+                board[idx] = 1
+            elif second_bits >> idx & 1:
+                board[idx] = -1
+        return cls(board=board.reshape(ROWS, COLS), current_player=player)
+
+    def key(self) -> int:
+        """Lossless integer encoding of the position, including the side to move."""
+        flat = self.board.reshape(-1)
+        weights = 1 << np.arange(ROWS * COLS, dtype=np.uint64)
+        first_bits = int(np.sum(weights[flat == 1], dtype=np.uint64))
+        second_bits = int(np.sum(weights[flat == -1], dtype=np.uint64))
+        player_bit = int(self.current_player == 1)
+        return (first_bits << (ROWS * COLS + 1)) | (second_bits << 1) | player_bit
+
     def clone(self) -> "GameState":
         return GameState(board=self.board.copy(), current_player=self.current_player)
 
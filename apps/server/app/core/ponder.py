@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Iterator, List, Optional, Tuple
+
+from ..adapters.base import InferenceResult
+from ..telemetry.metrics import MetricsStore
+from ..telemetry.profiler import backend_marker
+from .game import GameState
+from .registry import AdapterRegistry
+
+CacheKey = Tuple[str, int]
+
+
+@dataclass(order=True)
+class _PonderJob:
+    priority: Tuple[int, float, int]
+    backend: str = field(compare=False)
+    game: GameState = field(compare=False)
+    likelihood: float = field(compare=False)
+    depth: int = field(compare=False)
+
+
+@dataclass
+class _CacheEntry:
+    future: Future
+    hit: bool = False
+
+
+class Ponderer:
+    """Speculatively evaluates likely follow-up positions while backends are idle.
+
+    After every real inference the children of the answered position are queued, most
+    probable first according to the returned policy, and evaluated on background workers
+    up to ``depth`` plies ahead. Workers only start a speculative job while no real request
+    is in flight, so real traffic always goes first; a job that is already running when a
+    real request arrives is allowed to finish. Results land in a bounded LRU cache keyed
+    by backend and position.
+    """
+
+    def __init__(
+        self,
+        registry: AdapterRegistry,
+        metrics: MetricsStore,
+        enabled: bool = False,
+        workers: int = 1,
+        depth: int = 2,
+        queue_depth: int = 64,
+        cache_size: int = 1024,
+    ) -> None:
+        self.enabled = enabled
+        self._registry = registry
+        self._metrics = metrics
+        self._workers = max(1, workers)
+        self._depth = max(1, depth)
+        self._queue_depth = max(1, queue_depth)
+        self._cache_size = max(1, cache_size)
+        self._queue: List[_PonderJob] = []
+        self._cache: OrderedDict[CacheKey, _CacheEntry] = OrderedDict()
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._real_inflight = 0
+        self._generation = 0
+        self._seq = itertools.count()
+        self._stopped = False
+
+    @contextmanager
+    def real_request(self) -> Iterator[None]:
+        with self._cond:
+            self._real_inflight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._real_inflight -= 1
+                self._cond.notify_all()
+
+    def lookup(self, backend: str, game: GameState) -> Optional[InferenceResult]:
+        """Return a pondered result for ``game``, waiting on it if it is still being computed."""
+        if not self.enabled:
+            return None
+        start = time.perf_counter()
+        key = (backend, game.key())
+        with self._cond:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+        if entry is None or entry.future.cancelled():
+            self._metrics.increment(backend, "ponder_misses")
+            return None
+        try:
+            result: InferenceResult = entry.future.result()
+        except Exception:
+            self._metrics.increment(backend, "ponder_misses")
+            return None
+        entry.hit = True
+        self._metrics.increment(backend, "ponder_hits")
+        return replace(
+            result,
+            latency_ms=(time.perf_counter() - start) * 1000.0,
+            extras={**result.extras, "ponder_hit": 1.0, "ponder_compute_ms": result.latency_ms},
+        )
+
+    def schedule(self, backend: str, game: GameState, policy: List[float]) -> None:
+        """Queue the positions reachable from ``game`` for speculative evaluation."""
+        if not self.enabled:
+            return
+        self._ensure_started()
+        with self._cond:
+            self._generation += 1
+            self._enqueue_children(backend, game, policy, 1.0, 1, self._generation)
+            self._cond.notify_all()
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._queue.clear()
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads.clear()
+
+    def _ensure_started(self) -> None:
+        with self._cond:
+            if self._threads or self._stopped:
+                return
+            for index in range(self._workers):
+                thread = threading.Thread(target=self._run, name=f"ponder-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _enqueue_children(
+        self,
+        backend: str,
+        game: GameState,
+        policy: List[float],
+        likelihood: float,
+        depth: int,
+        generation: int,
+    ) -> None:
+        # Caller holds self._cond. Newer generations outrank older ones, then likelier lines.
+        for column in game.legal_moves():
+            child = game.clone()
+            child.drop_disc(column)
+            if child.winner() is not None or not child.legal_moves():
+                continue
+            child_likelihood = likelihood * float(policy[column])
+            job = _PonderJob(
+                priority=(-generation, -child_likelihood, next(self._seq)),
+                backend=backend,
+                game=child,
+                likelihood=child_likelihood,
+                depth=depth,
+            )
+            heapq.heappush(self._queue, job)
+        if len(self._queue) > self._queue_depth:
+            self._queue = heapq.nsmallest(self._queue_depth, self._queue)
+            heapq.heapify(self._queue)
+
+    def _next_job(self) -> Optional[Tuple[_PonderJob, _CacheEntry]]:
+        with self._cond:
+            while True:
+                while not self._stopped and (not self._queue or self._real_inflight > 0):
+                    self._cond.wait()
+                if self._stopped:
+                    return None
+                job = heapq.heappop(self._queue)
+                key = (job.backend, job.game.key())
+                if key in self._cache:
+                    continue
+                entry = _CacheEntry(future=Future())
+                entry.future.set_running_or_notify_cancel()
+                self._cache[key] = entry
+                self._evict()
+                return job, entry
+
+    def _evict(self) -> None:
+        # Caller holds self._cond.
+        while len(self._cache) > self._cache_size:
+            (backend, _), entry = self._cache.popitem(last=False)
+            if entry.hit or not entry.future.done() or entry.future.exception() is not None:
+                continue
+            self._metrics.increment(backend, "ponder_wasted")
+            self._metrics.increment(backend, "ponder_wasted_ms", entry.future.result().latency_ms)
+
+    def _run(self) -> None:
+        while True:
+            item = self._next_job()
+            if item is None:
+                return
+            job, entry = item
+            try:
+                with backend_marker(job.backend):
+                    result = self._registry.get(job.backend).infer(job.game)
+            except Exception as exc:  # pragma: no cover - adapters are not expected to fail
+                entry.future.set_exception(exc)
+                continue
+            entry.future.set_result(result)
+            self._metrics.increment(job.backend, "ponder_evaluations")
+            self._metrics.increment(job.backend, "ponder_compute_ms", result.latency_ms)
+            if job.depth < self._depth:
+                with self._cond:
+                    self._enqueue_children(
+                        job.backend,
+                        job.game,
+                        result.policy,
+                        job.likelihood,
+                        job.depth + 1,
+                        generation=-job.priority[0],
+                    )
+                    self._cond.notify_all()
@@ -1,18 +1,47 @@
 from __future__ import annotations
 
-from typing import Dict
+from pathlib import Path
+from typing import Dict, Optional
 
 from ..adapters.base import PolicyValueModel
 from ..adapters.cpu_adapter import HeuristicCpuModel
 from ..adapters.gpu_adapter import SimulatedGpuModel
+from ..adapters.simulation import ConstantLatency, VirtualClock, backend_rng, load_latency_profile
 from ..adapters.tpu_adapter import SimulatedTpuModel
+from ..config import settings
+
+
+def build_simulated_models(
+    seed: int = 0, profile: Optional[Path] = None, clock: Optional[VirtualClock] = None
+) -> Dict[str, PolicyValueModel]:
+    """Standard adapters on a shared virtual clock, each with its own seeded RNG.
+
+    Backends named in ``profile`` draw their end-to-end latency from it; their CPU delegate
+    is then zeroed so that the delegate's own delay is not counted twice.
+    """
+    clock = clock or VirtualClock()
+    latencies = load_latency_profile(profile) if profile else {}
+    no_delay = ConstantLatency(0.0)
+
+    def options(backend: str) -> Dict:
+        rng = backend_rng(seed, backend)
+        return {"clock": clock, "rng": rng, "latency": latencies.get(backend)}
+
+    def delegate(backend: str) -> Optional[ConstantLatency]:
+        return no_delay if backend in latencies else None
+
+    return {
+        "cpu": HeuristicCpuModel(**options("cpu")),
+        "gpu": SimulatedGpuModel(**options("gpu"), delegate_latency=delegate("gpu")),
+        "tpu": SimulatedTpuModel(**options("tpu"), delegate_latency=delegate("tpu")),
+    }
 
 
 class AdapterRegistry:
     """Keeps singletons for inference backends."""
 
-    def __init__(self) -> None:
-        self._models: Dict[str, PolicyValueModel] = {
+    def __init__(self, models: Optional[Dict[str, PolicyValueModel]] = None) -> None:
+        self._models: Dict[str, PolicyValueModel] = models or {
             "cpu": HeuristicCpuModel(),
             "gpu": SimulatedGpuModel(),
             "tpu": SimulatedTpuModel(),
@@ -28,4 +57,8 @@ class AdapterRegistry:
         return {key: model.name for key, model in self._models.items()}
 
 
-registry = AdapterRegistry()
+registry = AdapterRegistry(
+    build_simulated_models(settings.simulation_seed, settings.simulation_profile)
+    if settings.simulation_mode
+    else None
+)
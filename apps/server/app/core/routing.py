@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+from ..telemetry.metrics import MetricsStore
+from .admission import AdmissionController
+
+AUTO_BACKEND = "auto"
+ROUTING_POLICIES = ("expected_completion", "lowest_p95", "least_loaded")
+
+
+@dataclass
+class RouteCandidate:
+    backend: str
+    p50: float
+    p95: float
+    inflight: int
+    queued: int
+    score: float
+
+
+class LatencyRouter:
+    """Ranks backends for ``auto`` requests from live latency and current load.
+
+    ``expected_completion`` scales the recent p50 by how many requests are ahead of us per
+    slot, ``lowest_p95`` prefers the best tail regardless of load, and ``least_loaded``
+    prefers the emptiest backend, breaking ties on p50. Backends without samples score zero
+    so that latency-based policies explore them before committing to the others.
+    """
+
+    def __init__(
+        self,
+        metrics: MetricsStore,
+        admission: AdmissionController,
+        policy: str = "expected_completion",
+    ) -> None:
+        if policy not in ROUTING_POLICIES:
+            raise ValueError(f"Unknown routing policy '{policy}', expected {ROUTING_POLICIES}")
+        self.policy = policy
+        self._metrics = metrics
+        self._admission = admission
+
+    def rank(self, backends: Iterable[str]) -> List[RouteCandidate]:
+        snapshot = self._metrics.snapshot()
+        candidates = []
+        for backend in backends:
+            # Pondered hits only measure a cache lookup, not the backend.
+            records = [
+                rec
+                for rec in snapshot
+                if rec.get("backend") == backend and not rec.get("ponder_hit")
+            ]
+            stats = self._metrics.summarize("latency_ms", records)
+            load = self._admission.load(backend)
+            candidates.append(
+                RouteCandidate(
+                    backend=backend,
+                    p50=stats["p50"],
+                    p95=stats["p95"],
+                    inflight=load["inflight"],
+                    queued=load["queued"],
+                    score=self._score(stats, load),
+                )
+            )
+        return sorted(candidates, key=lambda candidate: (candidate.score, candidate.p50))
+
+    def _score(self, stats: Dict[str, float], load: Dict[str, int]) -> float:
+        if self.policy == "least_loaded":
+            return (load["inflight"] + load["queued"]) / load["max_inflight"]
+        if stats["count"] == 0:
+            return 0.0
+        if self.policy == "lowest_p95":
+            return stats["p95"]
+        # A saturated backend makes us wait for everyone queued ahead, one slot at a time.
+        waits = 0.0
+        if load["inflight"] >= load["max_inflight"]:
+            waits = (load["queued"] + 1) / load["max_inflight"]
+        return stats["p50"] * (1.0 + waits)
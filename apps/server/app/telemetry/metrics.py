@@ -1,17 +1,21 @@
 from __future__ import annotations
 
 import json
+import math
+import random
 import threading
 import time
 from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
 from statistics import mean
-from typing import Deque, Dict, Iterable, List
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Tuple
 
 import numpy as np
 from loguru import logger
 
 DEFAULT_MAX_RECORDS = 512
+SUBSCRIPTION_MODES = ("raw", "sampled", "aggregate")
 
 
 class MetricsStore:
@@ -20,6 +24,7 @@ class MetricsStore:
     def __init__(self, max_records: int = DEFAULT_MAX_RECORDS, log_path: Path | None = None) -> None:
         self._max_records = max_records
         self._records: Deque[Dict] = deque(maxlen=max_records)
+        self._counters: Dict[str, Dict[str, float]] = {}
         self._lock = threading.Lock()
         self._log_path = log_path
         if log_path:
@@ -41,6 +46,16 @@ class MetricsStore:
         with self._lock:
             return list(self._records)
 
+    def increment(self, backend: str, counter: str, amount: float = 1.0) -> None:
+        """Bump a monotonically increasing per-backend counter (not part of the sliding window)."""
+        with self._lock:
+            bucket = self._counters.setdefault(backend, {})
+            bucket[counter] = bucket.get(counter, 0.0) + amount
+
+    def counters(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {backend: dict(values) for backend, values in self._counters.items()}
+
     def summarize(self, metric: str, records: List[Dict] | None = None) -> Dict[str, float]:
         source = records if records is not None else self.snapshot()
         data = [rec[metric] for rec in source if metric in rec]
@@ -64,28 +79,132 @@ class MetricsStore:
             by_backend[backend] = {
                 metric: self.summarize(metric, backend_records) for metric in metrics
             }
-        return {"overall": overall, "by_backend": by_backend}
+        return {"overall": overall, "by_backend": by_backend, "counters": self.counters()}
+
+
+class TelemetryAggregate:
+    """Accumulates telemetry between aggregate ticks for one subscriber.
+
+    Counts, means and maxima are exact; percentiles and the latency series come from a
+    fixed-size reservoir, so each tick costs the same however many inferences arrived.
+    """
+
+    def __init__(self, reservoir_size: int = 1024, series_points: int = 32) -> None:
+        self._reservoir_size = reservoir_size
+        self._series_points = series_points
+        self._rng = random.Random()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._seen = 0
+        self._totals: Dict[str, List[float]] = {}
+        self._reservoir: List[Tuple[float, str, float, float]] = []
+
+    def add(self, record: Dict) -> None:
+        if "backend" not in record or "latency_ms" not in record:
+            return
+        backend = record["backend"]
+        latency = float(record["latency_ms"])
+        totals = self._totals.setdefault(backend, [0.0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += latency
+        totals[2] = max(totals[2], latency)
+        self._seen += 1
+        sample = (record.get("ts", time.time()), backend, latency, float(record.get("value", 0.0)))
+        if len(self._reservoir) < self._reservoir_size:
+            self._reservoir.append(sample)
+            return
+        slot = self._rng.randrange(self._seen)
+        if slot < self._reservoir_size:
+            self._reservoir[slot] = sample
+
+    def flush(self) -> Dict[str, Any]:
+        by_backend: Dict[str, Dict[str, float]] = {}
+        for backend, (count, total, peak) in self._totals.items():
+            sampled = [latency for _, name, latency, _ in self._reservoir if name == backend]
+            # A rare backend can be counted yet crowded out of the shared reservoir.
+            by_backend[backend] = {
+                "count": count,
+                "avg": total / count,
+                "p50": float(np.percentile(sampled, 50)) if sampled else total / count,
+                "p95": float(np.percentile(sampled, 95)) if sampled else peak,
+                "max": peak,
+            }
+        ordered = sorted(self._reservoir)
+        stride = max(1, math.ceil(len(ordered) / self._series_points))
+        series = [
+            {"ts": ts, "backend": backend, "latency_ms": latency, "value": value}
+            for ts, backend, latency, value in ordered[::stride]
+        ]
+        self._reset()
+        return {"by_backend": by_backend, "series": series}
+
+
+@dataclass
+class Subscription:
+    """Per-websocket delivery options for the telemetry stream.
+
+    ``raw`` forwards every record, ``sampled`` forwards each record with probability
+    ``sample_rate``, and ``aggregate`` sends one summary message every ``1 / rate_hz`` seconds.
+    """
+
+    mode: str = "raw"
+    rate_hz: float = 4.0
+    sample_rate: float = 0.1
+    aggregate: TelemetryAggregate = field(default_factory=TelemetryAggregate)
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> "Subscription":
+        subscription = cls()
+        subscription.update(options)
+        return subscription
+
+    def update(self, options: Mapping[str, Any]) -> None:
+        mode = options.get("mode", self.mode)
+        if mode not in SUBSCRIPTION_MODES:
+            raise ValueError(f"Unknown telemetry mode '{mode}', expected {SUBSCRIPTION_MODES}")
+        try:
+            rate_hz = float(options.get("rate_hz", self.rate_hz))
+            sample_rate = float(options.get("sample_rate", self.sample_rate))
+        except TypeError as exc:
+            raise ValueError("rate_hz and sample_rate must be numbers") from exc
+        if not 0.1 <= rate_hz <= 30.0:
+            raise ValueError("rate_hz must be between 0.1 and 30")
+        if not 0.0 < sample_rate <= 1.0:
+            raise ValueError("sample_rate must be in (0, 1]")
+        self.mode, self.rate_hz, self.sample_rate = mode, rate_hz, sample_rate
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.rate_hz
 
 
 class SubscriberSet:
-    """Maintains connected websocket subscribers."""
+    """Maintains connected websocket subscribers and their delivery options."""
 
     def __init__(self) -> None:
-        self._subs: set = set()
+        self._subs: Dict[Any, Subscription] = {}
         self._lock = threading.Lock()
+        self._rng = random.Random()
 
-    async def register(self, websocket) -> None:
+    async def register(self, websocket, subscription: Subscription | None = None) -> None:
         with self._lock:
-            self._subs.add(websocket)
+            self._subs[websocket] = subscription or Subscription()
 
     async def unregister(self, websocket) -> None:
         with self._lock:
-            self._subs.discard(websocket)
+            self._subs.pop(websocket, None)
 
     async def broadcast(self, payload: Dict) -> None:
         with self._lock:
-            subscribers = list(self._subs)
-        for ws in subscribers:
+            subscribers = list(self._subs.items())
+        for ws, subscription in subscribers:
+            if subscription.mode == "aggregate":
+                if payload.get("type") == "telemetry":
+                    subscription.aggregate.add(payload["record"])
+                continue
+            if subscription.mode == "sampled" and self._rng.random() >= subscription.sample_rate:
+                continue
             try:
                 await ws.send_json(payload)
             except Exception:
@@ -0,0 +1,237 @@
+"""On-demand sampling profiler and allocation tracker for a live server.
+
+Nothing here runs until an admin endpoint asks for it. The only always-on cost is
+:func:`backend_marker`, a dict store and delete per inference that lets a profile be
+narrowed to the threads currently working for one backend.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Dict, Iterator, List, Optional, Tuple
+
+PROFILE_FORMATS = ("speedscope", "collapsed")
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+Frame = Tuple[str, str, int]
+Stack = Tuple[Frame, ...]
+
+_thread_backends: Dict[int, str] = {}
+
+
+@contextmanager
+def backend_marker(backend: str) -> Iterator[None]:
+    """Tag the calling thread as working for ``backend`` until the block exits."""
+    ident = threading.get_ident()
+    _thread_backends[ident] = backend
+    try:
+        yield
+    finally:
+        _thread_backends.pop(ident, None)
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is still sampling."""
+
+
+@dataclass
+class Profile:
+    """Stack samples from one profiling window, keyed by (thread label, stack).
+
+    ``samples`` counts ticks; ``weights`` holds the wall time those ticks stood for, since a
+    tick under load takes longer than the nominal ``interval_s``.
+    """
+
+    duration_s: float
+    interval_s: float
+    backend: Optional[str] = None
+    samples: Counter = field(default_factory=Counter)
+    weights: Dict[Tuple[str, Stack], float] = field(default_factory=dict)
+
+    def add(self, label: str, stack: Stack, weight_s: float) -> None:
+        key = (label, stack)
+        self.samples[key] += 1
+        self.weights[key] = self.weights.get(key, 0.0) + weight_s
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.samples.values())
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's folded format: ``thread;outer;...;inner microseconds`` per line."""
+        lines = []
+        for (label, stack), weight_s in sorted(self.weights.items(), key=lambda item: -item[1]):
+            names = [label, *(_frame_name(frame) for frame in stack)]
+            weight_us = max(1, round(weight_s * 1e6))
+            lines.append(f"{';'.join(name.replace(';', ':') for name in names)} {weight_us}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def speedscope(self) -> Dict:
+        """Speedscope file with one sampled profile per thread, weighted in milliseconds."""
+        frame_index: Dict[Frame, int] = {}
+        frames: List[Dict] = []
+        by_thread: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+        for (label, stack), weight_s in self.weights.items():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    name, path, line = frame
+                    frames.append({"name": name, "file": path, "line": line})
+                indices.append(frame_index[frame])
+            thread_samples, weights = by_thread.setdefault(label, ([], []))
+            thread_samples.append(indices)
+            weights.append(weight_s * 1000.0)
+        profiles = [
+            {
+                "type": "sampled",
+                "name": label,
+                "unit": "milliseconds",
+                "startValue": 0.0,
+                "endValue": sum(weights),
+                "samples": thread_samples,
+                "weights": weights,
+            }
+            for label, (thread_samples, weights) in sorted(by_thread.items())
+        ]
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": f"aigb {self.backend or 'all'} {self.duration_s:g}s",
+            "exporter": "aigb-profiler",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+
+def _frame_name(frame: Frame) -> str:
+    name, path, line = frame
+    return f"{name} ({path}:{line})"
+
+
+def _stack(frame: Optional[FrameType]) -> Stack:
+    stack: List[Frame] = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+class SamplingProfiler:
+    """Samples every thread's Python stack via ``sys._current_frames`` for a bounded window."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def run(
+        self, duration_s: float, interval_s: float = 0.005, backend: Optional[str] = None
+    ) -> Profile:
+        """Block for ``duration_s`` while sampling; call from a worker thread, not the loop."""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        try:
+            return self._sample(duration_s, interval_s, backend)
+        finally:
+            self._lock.release()
+
+    def _sample(self, duration_s: float, interval_s: float, backend: Optional[str]) -> Profile:
+        profile = Profile(duration_s=duration_s, interval_s=interval_s, backend=backend)
+        own = threading.get_ident()
+        start = time.perf_counter()
+        deadline = start + duration_s
+        previous: Optional[float] = None
+        while True:
+            tick = time.perf_counter()
+            # Each tick stands for the wall time since the previous one, which includes the
+            # cost of walking every stack, not just the nominal interval.
+            weight_s = interval_s if previous is None else tick - previous
+            previous = tick
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():  # pylint: disable=protected-access
+                if ident == own:
+                    continue
+                marker = _thread_backends.get(ident)
+                if backend is not None and marker != backend:
+                    continue
+                label = names.get(ident, f"thread-{ident}")
+                if marker is not None:
+                    label = f"{label} [{marker}]"
+                profile.add(label, _stack(frame), weight_s)
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            # Sleep to the next point on a fixed grid, skipping any a slow tick overran.
+            next_tick = start + (math.floor((now - start) / interval_s) + 1) * interval_s
+            time.sleep(min(next_tick, deadline) - now)
+        profile.duration_s = time.perf_counter() - start
+        return profile
+
+
+class AllocationTracker:
+    """Wraps ``tracemalloc`` so each snapshot reports growth since the previous one."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._started_here = False
+
+    @property
+    def tracking(self) -> bool:
+        return self._baseline is not None
+
+    def start(self, frames: int = 16) -> None:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+                self._started_here = True
+            self._baseline = self._take()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._baseline = None
+            if self._started_here:
+                tracemalloc.stop()
+                self._started_here = False
+
+    def snapshot(self, limit: int = 20, group_by: str = "lineno") -> Dict:
+        """Top allocators by size growth since ``start`` or the previous snapshot."""
+        with self._lock:
+            if self._baseline is None:
+                raise RuntimeError("Allocation tracking is not running")
+            current = self._take()
+            diff = current.compare_to(self._baseline, group_by)
+            self._baseline = current
+        traced, peak = tracemalloc.get_traced_memory()
+        return {
+            "traced_bytes": traced,
+            "peak_bytes": peak,
+            "top": [
+                {
+                    "location": str(stat.traceback[0]) if stat.traceback else "<unknown>",
+                    "size_diff": stat.size_diff,
+                    "size": stat.size,
+                    "count_diff": stat.count_diff,
+                    "count": stat.count,
+                }
+                for stat in diff[:limit]
+            ],
+        }
+
+    @staticmethod
+    def _take() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+
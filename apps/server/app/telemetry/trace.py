@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from loguru import logger
+
+from ..core.game import GameState
+
+
+class TraceRecorder:
+    """Samples /infer requests into an NDJSON trace that ``bench.loadgen --replay`` can re-issue.
+
+    Each line holds the arrival time, the backend the client asked for, the position as the
+    hex form of ``GameState.key()``, the optional deadline, and what the server observed
+    (status, queue time and model latency) so replays can be diffed against the original.
+    """
+
+    def __init__(self, path: Optional[Path], sample_rate: float = 1.0) -> None:
+        self._path = path
+        self._sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+        if path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self._path is not None and self._sample_rate > 0.0
+
+    def sampled(self) -> bool:
+        """Decide once per request, at arrival, whether it belongs in the trace."""
+        return self.enabled and self._rng.random() < self._sample_rate
+
+    def record(
+        self,
+        arrival_ts: float,
+        backend: str,
+        game: GameState,
+        status: int = 200,
+        deadline_ms: Optional[float] = None,
+        queue_ms: float = 0.0,
+        latency_ms: float = 0.0,
+    ) -> None:
+        entry: Dict = {
+            "t": arrival_ts,
+            "backend": backend,
+            "pos": format(game.key(), "x"),
+            "status": status,
+            "queue_ms": queue_ms,
+            "latency_ms": latency_ms,
+        }
+        if deadline_ms is not None:
+            entry["deadline_ms"] = deadline_ms
+        try:
+            with self._lock, self._path.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(entry) + "\n")
+        except Exception as exc:  # pragma: no cover
+            logger.warning("Failed to persist trace record: {}", exc)
+
+
+def read_trace(path: Path) -> Iterator[Dict]:
+    """Yield trace entries in arrival order with the position decoded into ``game``."""
+    with path.open("r", encoding="utf-8") as fh:
+        entries = [json.loads(line) for line in fh if line.strip()]
+    for entry in sorted(entries, key=lambda item: item["t"]):
+        yield {**entry, "game": GameState.from_key(int(entry["pos"], 16))}
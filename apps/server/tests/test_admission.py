@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionController, AdmissionRejectedError
+from app.telemetry.metrics import MetricsStore
+
+
+async def _hold(controller: AdmissionController, release: asyncio.Event) -> None:
+    async with controller.admit("cpu"):
+        await release.wait()
+
+
+def test_queue_full_is_rejected_with_429():
+    async def scenario() -> None:
+        metrics = MetricsStore()
+        controller = AdmissionController(metrics, max_inflight=1, max_queue=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, release))
+        queued = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0)
+        assert controller.load("cpu") == {"inflight": 1, "queued": 1, "max_inflight": 1}
+        with pytest.raises(AdmissionRejectedError) as excinfo:
+            async with controller.admit("cpu"):
+                pass
+        assert excinfo.value.status_code == 429
+        assert excinfo.value.retry_after >= 1
+        release.set()
+        await asyncio.gather(holder, queued)
+        counters = metrics.counters()["cpu"]
+        assert counters["shed_queue_full"] == 1.0
+        assert counters["admitted"] == 2.0
+        assert controller.load("cpu")["inflight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_expired_deadline_is_shed_before_running():
+    async def scenario() -> None:
+        metrics = MetricsStore()
+        controller = AdmissionController(metrics, max_inflight=1, max_queue=4)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0)
+        ran = False
+        with pytest.raises(AdmissionRejectedError) as excinfo:
+            async with controller.admit("cpu", deadline_ms=10):
+                ran = True
+        assert excinfo.value.status_code == 503
+        assert not ran
+        assert controller.load("cpu")["queued"] == 0
+        release.set()
+        await holder
+        assert metrics.counters()["cpu"]["shed_deadline"] == 1.0
+
+    asyncio.run(scenario())
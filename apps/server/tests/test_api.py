@@ -1,6 +1,12 @@
 from fastapi.testclient import TestClient
 
+from app import api
 from app.api import app
+from app.core.admission import AdmissionController
+from app.core.book import OpeningBook, build_book
+from app.core.registry import build_simulated_models
+from app.core.routing import RouteCandidate
+from app.telemetry.metrics import MetricsStore
 
 client = TestClient(app)
 
@@ -36,3 +42,148 @@ def test_metrics_summary_updates() -> None:
     payload = summary.json()
     assert "overall" in payload
     assert "latency_ms" in payload["overall"]
+
+
+def test_infer_reports_queue_time() -> None:
+    board = [[0] * 7 for _ in range(6)]
+    response = client.post("/infer", json={"board": board, "backend": "cpu", "deadline_ms": 5000})
+    assert response.status_code == 200
+    assert response.json()["extras"]["queue_ms"] >= 0.0
+
+
+def test_infer_auto_routes_to_a_backend() -> None:
+    board = [[0] * 7 for _ in range(6)]
+    response = client.post("/infer", json={"board": board, "backend": "auto"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["backend"] in {"cpu", "gpu", "tpu"}
+    assert body["extras"]["route_auto"] == 1.0
+    assert body["extras"]["hedged"] == 0.0
+
+
+class _FixedRouter:
+    policy = "fixed"
+
+    def rank(self, backends):
+        return [
+            RouteCandidate(backend="cpu", p50=1.0, p95=5.0, inflight=1, queued=0, score=0.0),
+            RouteCandidate(backend="gpu", p50=1.0, p95=5.0, inflight=0, queued=0, score=1.0),
+        ]
+
+
+def test_auto_fails_over_when_primary_queue_is_full(monkeypatch) -> None:
+    controller = AdmissionController(MetricsStore(), max_inflight=1, max_queue=0)
+    controller._gate("cpu").inflight = 1  # pylint: disable=protected-access
+    monkeypatch.setattr(api, "admission", controller)
+    monkeypatch.setattr(api, "router", _FixedRouter())
+    monkeypatch.setattr(api.settings, "hedge_enabled", False)
+
+    board = [[0] * 7 for _ in range(6)]
+    response = client.post("/infer", json={"board": board, "backend": "auto"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["backend"] == "gpu"
+    assert body["extras"]["route_failovers"] == 1.0
+    assert body["extras"]["hedged"] == 0.0
+
+    controller._gate("gpu").inflight = 1  # pylint: disable=protected-access
+    response = client.post("/infer", json={"board": board, "backend": "auto"})
+    assert response.status_code == 429
+
+
+def test_hedge_wins_over_stalled_primary(monkeypatch) -> None:
+    # cpu's only slot is taken, so the primary sits in the admission queue past its p95.
+    gate_metrics = MetricsStore()
+    controller = AdmissionController(gate_metrics, max_inflight=1, max_queue=4)
+    controller._gate("cpu").inflight = 1  # pylint: disable=protected-access
+    monkeypatch.setattr(api, "admission", controller)
+    monkeypatch.setattr(api, "router", _FixedRouter())
+    monkeypatch.setattr(api.settings, "hedge_enabled", True)
+    before = api.metrics_store.counters().get("gpu", {})
+
+    board = [[0] * 7 for _ in range(6)]
+    response = client.post("/infer", json={"board": board, "backend": "auto"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["backend"] == "gpu"
+    assert body["extras"]["hedged"] == 1.0
+    assert body["extras"]["hedge_won"] == 1.0
+    after = api.metrics_store.counters()["gpu"]
+    assert after["hedges_fired"] == before.get("hedges_fired", 0.0) + 1
+    assert after["hedges_won"] == before.get("hedges_won", 0.0) + 1
+    # The losing primary was cancelled while queued instead of running the model later.
+    assert controller.load("cpu")["queued"] == 0
+    assert "admitted" not in gate_metrics.counters().get("cpu", {})
+
+
+def test_telemetry_stream_aggregates() -> None:
+    board = [[0] * 7 for _ in range(6)]
+    with client.websocket_connect("/ws/telemetry?mode=aggregate&rate_hz=20") as ws:
+        client.post("/infer", json={"board": board, "backend": "cpu"})
+        for _ in range(40):
+            message = ws.receive_json()
+            assert message["type"] == "aggregate"
+            if "cpu" in message["by_backend"]:
+                break
+        assert message["by_backend"]["cpu"]["count"] >= 1
+        assert message["series"][0]["backend"] == "cpu"
+        assert "overall" in message["summary"]
+
+
+def test_telemetry_stream_reports_bad_subscribe_options() -> None:
+    with client.websocket_connect("/ws/telemetry") as ws:
+        ws.send_json({"type": "subscribe", "rate_hz": None})
+        assert ws.receive_json()["type"] == "error"
+        ws.send_json({"type": "subscribe", "mode": "aggregate", "rate_hz": 20})
+        assert ws.receive_json()["type"] == "aggregate"
+
+
+def test_telemetry_stream_switches_to_aggregate() -> None:
+    with client.websocket_connect("/ws/telemetry") as ws:
+        ws.send_json({"type": "subscribe", "mode": "aggregate", "rate_hz": 20})
+        assert ws.receive_json()["type"] == "aggregate"
+
+
+def test_infer_serves_opening_book(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "book.bin"
+    build_book(build_simulated_models()["cpu"], 1, path)
+    monkeypatch.setattr(api, "opening_book", OpeningBook(path))
+    board = [[0] * 7 for _ in range(6)]
+    response = client.post("/infer", json={"board": board, "backend": "gpu"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["backend"] == "book"
+    assert body["extras"]["book_hit"] == 1.0
+    assert body["model"] == "book:heuristic-cpu"
+
+
+def test_debug_endpoints_hidden_unless_debug_mode(monkeypatch) -> None:
+    assert client.post("/debug/profile", params={"seconds": 0.01}).status_code == 404
+    assert client.get("/debug/allocations").status_code == 404
+    monkeypatch.setattr(api.settings, "debug_mode", True)
+    monkeypatch.setattr(api.settings, "admin_token", "s3cret")
+    admin = TestClient(app, headers={"X-Admin-Token": "s3cret"})
+    response = admin.post("/debug/profile", params={"seconds": 0.05, "backend": "cpu"})
+    assert response.status_code == 200
+    assert "profiles" in response.json()
+    collapsed = admin.post("/debug/profile", params={"seconds": 0.01, "format": "collapsed"})
+    assert collapsed.headers["content-type"].startswith("text/plain")
+    assert admin.post("/debug/profile", params={"format": "pprof"}).status_code == 400
+    assert admin.get("/debug/allocations").status_code == 409
+    assert admin.post("/debug/allocations/start").status_code == 200
+    assert "top" in admin.get("/debug/allocations").json()
+    assert admin.delete("/debug/allocations").json() == {"tracking": False}
+
+
+def test_debug_endpoints_require_admin(monkeypatch) -> None:
+    monkeypatch.setattr(api.settings, "debug_mode", True)
+    monkeypatch.setattr(api.settings, "admin_token", "s3cret")
+    assert client.post("/debug/allocations/start").status_code == 401
+    wrong = client.post("/debug/allocations/start", headers={"X-Admin-Token": "guess"})
+    assert wrong.status_code == 401
+    assert not api.allocations.tracking
+    # With no token configured, only loopback clients get through.
+    monkeypatch.setattr(api.settings, "admin_token", None)
+    assert client.post("/debug/profile", params={"seconds": 0.01}).status_code == 403
+    monkeypatch.setattr(api, "LOOPBACK_HOSTS", ("testclient",))
+    assert client.post("/debug/profile", params={"seconds": 0.01}).status_code == 200
@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from app.adapters.base import PolicyValueModel
+from app.core.game import COLS, GameState
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from bench.arena import MatchResult, MctsAgent, fit_elo, generate_openings  # noqa: E402
+
+
+class UniformModel(PolicyValueModel):
+    """No opinion at all, so any tactics have to come from the search itself."""
+
+    name = "uniform"
+
+    def __init__(self) -> None:
+        super().__init__(backend="test")
+
+    def load(self) -> None:
+        return
+
+    def _infer_impl(self, game):
+        return [1.0 / COLS] * COLS, 0.0, {}
+
+
+def _result(first: str, second: str, score: float) -> MatchResult:
+    return MatchResult(first, second, "", 0.0, score, 0, 0, 0, 0.0, 0.0)
+
+
+def _state(moves) -> GameState:
+    state = GameState()
+    for column in moves:
+        state.drop_disc(column)
+    return state
+
+
+def test_elo_orders_agents_and_ignores_colour_assignment():
+    agents = ["a", "b", "c"]
+    results = []
+    for _ in range(30):
+        results += [_result("a", "b", 1.0), _result("b", "c", 1.0), _result("a", "c", 1.0)]
+        results += [_result("b", "a", 1.0), _result("c", "b", 0.5)]
+    elo = fit_elo(results, agents)
+    assert elo[0] > elo[1] > elo[2]
+    assert abs(elo.sum()) < 1e-6
+    swapped = [_result(r.second, r.first, 1.0 - r.score) for r in results]
+    assert np.allclose(fit_elo(swapped, agents), elo)
+
+
+def test_elo_of_evenly_matched_agents_is_zero():
+    results = [_result("a", "b", 1.0), _result("b", "a", 1.0), _result("a", "b", 0.5)]
+    assert np.allclose(fit_elo(results, ["a", "b"]), 0.0)
+
+
+def test_mcts_takes_an_immediate_win():
+    # Player 1 owns columns 0-2 on the bottom row and is to move.
+    for moves, winning_column in (([0, 0, 1, 1, 2, 6], 3), ([6, 6, 5, 5, 4, 0], 3)):
+        column, stats = MctsAgent(UniformModel(), nodes=64).choose(_state(moves))
+        assert column == winning_column
+        assert stats.evaluations <= 64
+
+
+def test_mcts_blocks_an_opponent_threat():
+    # Player -1 is to move and must stop player 1 completing the bottom row at column 3.
+    column, _ = MctsAgent(UniformModel(), nodes=200).choose(_state([0, 6, 1, 6, 2]))
+    assert column == 3
+
+
+def test_openings_are_distinct_and_non_terminal():
+    openings = generate_openings(count=20, plies=4, seed=7)
+    assert len(openings) == 20
+    assert len(set(openings)) == 20
+    for opening in openings:
+        assert len(opening) == 4
+        state = _state(opening)
+        assert state.winner() is None and state.legal_moves()
+    assert generate_openings(count=20, plies=4, seed=7) == openings
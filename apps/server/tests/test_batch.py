@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from app.core.batch import GameBatch
+from app.core.game import COLS, ROWS, GameState
+
+
+def test_batch_matches_single_game_engine():
+    rng = np.random.default_rng(0)
+    states = [GameState() for _ in range(64)]
+    batch = GameBatch.from_states(states)
+    while len(batch):
+        columns = np.array([rng.choice(np.flatnonzero(row)) for row in batch.legal_mask()])
+        batch.drop_discs(columns)
+        for game, column in zip(batch.ids, columns):
+            states[game].drop_disc(int(column))
+        live = [states[game] for game in batch.ids]
+        assert np.array_equal(batch.boards, np.stack([s.board for s in live]))
+        assert batch.winners().tolist() == [s.winner() or 0 for s in live]
+        planes = batch.encode_planes()
+        assert planes.shape == (len(live), 3, ROWS, COLS)
+        assert np.array_equal(planes, np.stack([s.encode_planes() for s in live]))
+        batch.compact()
+    assert all(s.winner() is not None or s.is_full() for s in states)
+
+
+def test_compact_removes_finished_games_and_keeps_ids():
+    batch = GameBatch(3)
+    for _ in range(3):
+        batch.drop_discs([0, 1, 2])
+        batch.drop_discs([1, 2, 3])
+    batch.drop_discs([0, 4, 5])
+    ids, winners = batch.compact()
+    assert ids.tolist() == [0]
+    assert winners.tolist() == [1]
+    assert batch.ids.tolist() == [1, 2]
+    assert len(batch) == 2 and batch.encode_planes().shape[0] == 2
+
+
+def test_drop_discs_rejects_full_columns():
+    batch = GameBatch(1)
+    for _ in range(ROWS):
+        batch.drop_discs([0])
+    assert not batch.legal_mask()[0, 0]
+    with pytest.raises(ValueError):
+        batch.drop_discs([0])
@@ -0,0 +1,43 @@
+import numpy as np
+
+from app.core.book import OpeningBook, build_book, canonical_key, enumerate_positions
+from app.core.game import GameState
+from app.core.registry import build_simulated_models
+
+
+def _build(tmp_path, depth=2):
+    path = tmp_path / "book.bin"
+    build_book(build_simulated_models(seed=1)["cpu"], depth, path)
+    return OpeningBook(path)
+
+
+def test_mirror_positions_share_a_key():
+    left, right = GameState(), GameState()
+    left.drop_disc(0)
+    right.drop_disc(6)
+    assert canonical_key(left)[0] == canonical_key(right)[0]
+    # Empty board, 4 first moves, and 49 two-disc boards of which only the 3/3 stack is symmetric.
+    assert len(enumerate_positions(2)) == 1 + 4 + (48 // 2 + 1)
+
+
+def test_lookup_mirrors_policy(tmp_path):
+    book = _build(tmp_path)
+    left, right = GameState(), GameState()
+    left.drop_disc(1)
+    right.drop_disc(5)
+    left_policy, left_value = book.lookup(left)
+    right_policy, right_value = book.lookup(right)
+    assert np.allclose(left_policy, right_policy[::-1])
+    assert left_value == right_value
+    assert abs(sum(left_policy) - 1.0) < 1e-5
+
+
+def test_lookup_misses_outside_book(tmp_path):
+    book = _build(tmp_path, depth=1)
+    deep = GameState()
+    for column in (3, 3, 3):
+        deep.drop_disc(column)
+    assert book.lookup(deep) is None
+    floating = GameState()
+    floating.board[0, 0] = 1
+    assert book.lookup(floating) is None
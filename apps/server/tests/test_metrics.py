@@ -0,0 +1,40 @@
+import pytest
+
+from app.telemetry.metrics import Subscription, TelemetryAggregate
+
+
+def test_aggregate_counts_are_exact_and_series_is_bounded():
+    aggregate = TelemetryAggregate(reservoir_size=64, series_points=16)
+    for index in range(1000):
+        backend = "gpu" if index % 2 else "cpu"
+        aggregate.add({"backend": backend, "latency_ms": float(index), "ts": index})
+    payload = aggregate.flush()
+    assert payload["by_backend"]["cpu"]["count"] == 500
+    assert payload["by_backend"]["gpu"]["max"] == 999.0
+    assert len(payload["series"]) <= 16
+    timestamps = [point["ts"] for point in payload["series"]]
+    assert timestamps == sorted(timestamps)
+    assert aggregate.flush() == {"by_backend": {}, "series": []}
+
+
+def test_aggregate_handles_backend_missing_from_reservoir():
+    aggregate = TelemetryAggregate(reservoir_size=8)
+    aggregate.add({"backend": "tpu", "latency_ms": 3.0, "ts": 0})
+    for index in range(5000):
+        aggregate.add({"backend": "cpu", "latency_ms": 40.0, "ts": index + 1})
+    tpu = aggregate.flush()["by_backend"]["tpu"]
+    assert tpu["count"] == 1
+    assert tpu["p50"] == tpu["p95"] == 3.0
+
+
+def test_subscription_validates_options():
+    subscription = Subscription.from_options({"mode": "sampled", "sample_rate": "0.5"})
+    assert subscription.sample_rate == 0.5
+    with pytest.raises(ValueError):
+        subscription.update({"mode": "firehose"})
+    with pytest.raises(ValueError):
+        subscription.update({"rate_hz": 0})
+    for bad in (None, [1], {"hz": 1}):
+        with pytest.raises(ValueError):
+            subscription.update({"rate_hz": bad})
+    assert subscription.rate_hz == Subscription().rate_hz
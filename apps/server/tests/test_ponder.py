@@ -0,0 +1,63 @@
+import time
+
+from app.core.game import COLS, GameState
+from app.core.ponder import Ponderer
+from app.core.registry import AdapterRegistry
+from app.telemetry.metrics import MetricsStore
+
+
+def _wait_for_evaluations(metrics: MetricsStore, expected: float, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if metrics.counters().get("cpu", {}).get("ponder_evaluations", 0.0) >= expected:
+            return
+        time.sleep(0.01)
+    raise AssertionError("pondering did not finish in time")
+
+
+def test_game_key_round_trip():
+    state = GameState()
+    for column in (3, 3, 2, 6):
+        state.drop_disc(column)
+    restored = GameState.from_key(state.key())
+    assert (restored.board == state.board).all()
+    assert restored.current_player == state.current_player
+
+
+def test_ponder_hit_after_speculation():
+    metrics = MetricsStore()
+    ponderer = Ponderer(AdapterRegistry(), metrics, enabled=True, depth=1)
+    root = GameState()
+    try:
+        ponderer.schedule("cpu", root, [1.0 / COLS] * COLS)
+        _wait_for_evaluations(metrics, COLS)
+        reply = root.clone()
+        reply.drop_disc(3)
+        result = ponderer.lookup("cpu", reply)
+    finally:
+        ponderer.shutdown()
+    assert result is not None
+    assert result.extras["ponder_hit"] == 1.0
+    assert result.latency_ms < result.extras["ponder_compute_ms"]
+    assert metrics.counters()["cpu"]["ponder_hits"] == 1.0
+
+
+def test_ponder_waits_for_real_requests():
+    metrics = MetricsStore()
+    ponderer = Ponderer(AdapterRegistry(), metrics, enabled=True, depth=1)
+    try:
+        with ponderer.real_request():
+            ponderer.schedule("cpu", GameState(), [1.0 / COLS] * COLS)
+            time.sleep(0.1)
+            assert "cpu" not in metrics.counters()
+        _wait_for_evaluations(metrics, 1)
+    finally:
+        ponderer.shutdown()
+
+
+def test_ponder_disabled_is_a_miss():
+    metrics = MetricsStore()
+    ponderer = Ponderer(AdapterRegistry(), metrics)
+    ponderer.schedule("cpu", GameState(), [1.0 / COLS] * COLS)
+    assert ponderer.lookup("cpu", GameState()) is None
+    assert metrics.counters() == {}
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from app.telemetry import profiler
+from app.telemetry.profiler import (
+    AllocationTracker,
+    ProfilerBusyError,
+    SamplingProfiler,
+    backend_marker,
+)
+
+
+def _spin_for_backend(backend: str, stop: threading.Event) -> None:
+    with backend_marker(backend):
+        while not stop.is_set():
+            sum(range(1000))
+
+
+def test_profile_filters_by_backend_and_exports_formats():
+    stop = threading.Event()
+    workers = [
+        threading.Thread(target=_spin_for_backend, args=(backend, stop), name=f"worker-{backend}")
+        for backend in ("cpu", "gpu")
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        profile = SamplingProfiler().run(0.1, interval_s=0.002, backend="gpu")
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+
+    assert profile.sample_count > 0
+    labels = {label for label, _ in profile.samples}
+    assert labels == {"worker-gpu [gpu]"}
+    collapsed = profile.collapsed()
+    assert "_spin_for_backend" in collapsed
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed.splitlines())
+    document = profile.speedscope()
+    frames = document["shared"]["frames"]
+    (sampled,) = document["profiles"]
+    assert sampled["type"] == "sampled"
+    assert len(sampled["samples"]) == len(sampled["weights"])
+    assert all(0 <= index < len(frames) for stack in sampled["samples"] for index in stack)
+
+
+def test_profile_weights_follow_wall_time_when_ticks_are_slow(monkeypatch):
+    real_stack = profiler._stack  # pylint: disable=protected-access
+
+    def slow_stack(frame):
+        time.sleep(0.01)
+        return real_stack(frame)
+
+    monkeypatch.setattr(profiler, "_stack", slow_stack)
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin_for_backend, args=("cpu", stop))
+    worker.start()
+    try:
+        profile = SamplingProfiler().run(0.2, interval_s=0.001, backend="cpu")
+    finally:
+        stop.set()
+        worker.join()
+
+    # Ticks take ~10x the nominal interval; the weights must still add up to the window.
+    (sampled,) = profile.speedscope()["profiles"]
+    assert 0.7 * profile.duration_s * 1000 <= sampled["endValue"] <= 1.3 * profile.duration_s * 1000
+    assert profile.sample_count * profile.interval_s < 0.5 * profile.duration_s
+
+
+def test_profiler_rejects_concurrent_runs():
+    sampler = SamplingProfiler()
+    runner = threading.Thread(target=sampler.run, args=(0.2,))
+    runner.start()
+    time.sleep(0.05)
+    with pytest.raises(ProfilerBusyError):
+        sampler.run(0.01)
+    runner.join()
+    assert not sampler.running
+
+
+def test_allocation_snapshot_reports_growth_between_points():
+    tracker = AllocationTracker()
+    with pytest.raises(RuntimeError):
+        tracker.snapshot()
+    tracker.start()
+    try:
+        retained = [bytearray(1024) for _ in range(512)]
+        report = tracker.snapshot(limit=5)
+        assert report["top"][0]["size_diff"] >= 512 * 1024
+        assert "test_profiler.py" in report["top"][0]["location"]
+        assert tracker.snapshot(limit=5)["top"][0]["size_diff"] < 512 * 1024
+    finally:
+        tracker.stop()
+    assert retained and not tracker.tracking
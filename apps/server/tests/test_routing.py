@@ -0,0 +1,40 @@
+from app.core.admission import AdmissionController
+from app.core.routing import LatencyRouter
+from app.telemetry.metrics import MetricsStore
+
+
+def _store_with_latencies() -> MetricsStore:
+    metrics = MetricsStore()
+    for latency in (40.0, 42.0, 44.0):
+        metrics.add({"backend": "cpu", "latency_ms": latency})
+    for latency in (10.0, 12.0, 90.0):
+        metrics.add({"backend": "gpu", "latency_ms": latency})
+    return metrics
+
+
+def test_expected_completion_prefers_fast_median():
+    metrics = _store_with_latencies()
+    router = LatencyRouter(metrics, AdmissionController(metrics))
+    ranked = router.rank(["cpu", "gpu"])
+    assert [candidate.backend for candidate in ranked] == ["gpu", "cpu"]
+
+
+def test_lowest_p95_prefers_tight_tail():
+    metrics = _store_with_latencies()
+    router = LatencyRouter(metrics, AdmissionController(metrics), policy="lowest_p95")
+    assert router.rank(["cpu", "gpu"])[0].backend == "cpu"
+
+
+def test_unsampled_backend_is_explored_first():
+    metrics = _store_with_latencies()
+    router = LatencyRouter(metrics, AdmissionController(metrics))
+    assert router.rank(["cpu", "gpu", "tpu"])[0].backend == "tpu"
+
+
+def test_pondered_hits_are_ignored():
+    metrics = _store_with_latencies()
+    for _ in range(20):
+        metrics.add({"backend": "cpu", "latency_ms": 0.01, "ponder_hit": 1.0})
+    router = LatencyRouter(metrics, AdmissionController(metrics))
+    cpu = next(candidate for candidate in router.rank(["cpu", "gpu"]) if candidate.backend == "cpu")
+    assert cpu.p50 == 42.0
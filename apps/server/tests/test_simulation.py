@@ -0,0 +1,43 @@
+import json
+import time
+
+from app.adapters.simulation import VirtualClock, load_latency_profile
+from app.core.game import GameState
+from app.core.registry import build_simulated_models
+
+
+def test_virtual_clock_reports_simulated_latency_without_sleeping():
+    clock = VirtualClock()
+    models = build_simulated_models(seed=7, clock=clock)
+    start = time.perf_counter()
+    results = [models["cpu"].infer(GameState()) for _ in range(20)]
+    assert time.perf_counter() - start < 0.5
+    assert all(35.0 <= result.latency_ms <= 45.0 for result in results)
+    assert clock.advanced >= 20 * 0.035
+
+
+def test_simulation_is_reproducible_per_seed():
+    first = build_simulated_models(seed=3)["gpu"].infer(GameState())
+    second = build_simulated_models(seed=3)["gpu"].infer(GameState())
+    other = build_simulated_models(seed=4)["gpu"].infer(GameState())
+    assert first.latency_ms == second.latency_ms
+    assert first.policy == second.policy
+    assert first.latency_ms != other.latency_ms
+
+
+def test_latency_profile_fitted_from_telemetry(tmp_path):
+    profile = tmp_path / "telemetry.ndjson"
+    lines = [{"backend": "tpu", "latency_ms": 5.0, "value": 0.0}] * 3
+    profile.write_text("\n".join(json.dumps(line) for line in lines) + "\n", encoding="utf-8")
+    assert set(load_latency_profile(profile)) == {"tpu"}
+    models = build_simulated_models(profile=profile)
+    assert abs(models["tpu"].infer(GameState()).latency_ms - 5.0) < 1e-6
+    assert models["cpu"].infer(GameState()).latency_ms >= 35.0
+
+
+def test_parametric_latency_profile(tmp_path):
+    profile = tmp_path / "profile.json"
+    spec = {"cpu": {"kind": "constant", "seconds": 0.002}}
+    profile.write_text(json.dumps(spec), encoding="utf-8")
+    models = build_simulated_models(profile=profile)
+    assert abs(models["cpu"].infer(GameState()).latency_ms - 2.0) < 1e-6
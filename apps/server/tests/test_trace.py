@@ -0,0 +1,21 @@
+from app.core.game import GameState
+from app.telemetry.trace import TraceRecorder, read_trace
+
+
+def test_trace_round_trip(tmp_path):
+    path = tmp_path / "trace.ndjson"
+    recorder = TraceRecorder(path)
+    later, earlier = GameState(), GameState()
+    later.drop_disc(3)
+    recorder.record(20.0, "gpu", later, latency_ms=9.5)
+    recorder.record(10.0, "auto", earlier, status=429, deadline_ms=50.0)
+    entries = list(read_trace(path))
+    assert [entry["t"] for entry in entries] == [10.0, 20.0]
+    assert entries[0]["status"] == 429 and entries[0]["deadline_ms"] == 50.0
+    assert (entries[1]["game"].board == later.board).all()
+    assert entries[1]["game"].current_player == later.current_player
+
+
+def test_trace_sampling_disabled_without_path():
+    assert not TraceRecorder(None).sampled()
+    assert not TraceRecorder(None, sample_rate=1.0).enabled
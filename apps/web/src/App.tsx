@@ -52,14 +52,16 @@ function App() {
   const [isAiThinking, setIsAiThinking] = useState<boolean>(false);
   const [introLine, setIntroLine] = useState(0);
 
-  const telemetryRecords = useTelemetryStream();
+  const { records: telemetryRecords, summary: streamSummary } = useTelemetryStream();
 
-  const { data: summary, refetch: refetchSummary } = useQuery({
+  // Aggregate websocket ticks carry the window summary; poll only until the first one lands.
+  const { data: polledSummary, refetch: refetchSummary } = useQuery({
     queryKey: ["summary"],
     queryFn: fetchSummary,
-    refetchInterval: 5000,
+    refetchInterval: streamSummary ? false : 5000,
     suspense: false
   });
+  const summary = streamSummary ?? polledSummary;
 
   const { data: backends } = useQuery<BackendInfo[]>({
     queryKey: ["backends"],
@@ -130,9 +132,11 @@ function App() {
       setTimeout(() => {
         setHintColumn(undefined);
       }, 400);
-      setTimeout(() => {
-        refetchSummary();
-      }, 150);
+      if (!streamSummary) {
+        setTimeout(() => {
+          refetchSummary();
+        }, 150);
+      }
     } catch (error) {
       console.error(error);
       setStatusMessage(error instanceof Error ? error.message : "Inference failed");
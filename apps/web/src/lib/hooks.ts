@@ -1,6 +1,6 @@
 import { useCallback, useEffect, useRef, useState } from "react";
 
-import type { MetricsSummary, TelemetryRecord } from "./types";
+import type { MetricsSummary, TelemetryAggregate, TelemetryMode, TelemetryRecord } from "./types";
 
 const API_BASE = "/api";
 
@@ -31,19 +31,43 @@ export const postInfer = async (payload: unknown) => {
   return res.json();
 };
 
-export const useTelemetryStream = () => {
+const MAX_RECORDS = 128;
+
+interface TelemetryStreamOptions {
+  mode?: TelemetryMode;
+  rateHz?: number;
+  sampleRate?: number;
+}
+
+export const useTelemetryStream = ({
+  mode = "aggregate",
+  rateHz = 4,
+  sampleRate = 0.1
+}: TelemetryStreamOptions = {}) => {
   const [records, setRecords] = useState<TelemetryRecord[]>([]);
+  const [summary, setSummary] = useState<MetricsSummary | undefined>(undefined);
   const wsRef = useRef<WebSocket | null>(null);
 
   const connect = useCallback(() => {
     const protocol = window.location.protocol === "https:" ? "wss" : "ws";
-    const ws = new WebSocket(`${protocol}://${window.location.host}/ws/telemetry`);
+    const params = new URLSearchParams({
+      mode,
+      rate_hz: String(rateHz),
+      sample_rate: String(sampleRate)
+    });
+    const ws = new WebSocket(`${protocol}://${window.location.host}/ws/telemetry?${params}`);
     wsRef.current = ws;
     ws.onmessage = (event) => {
       try {
         const payload = JSON.parse(event.data);
         if (payload.type === "telemetry") {
-          setRecords((prev) => [...prev.slice(-127), payload.record]);
+          setRecords((prev) => [...prev.slice(-(MAX_RECORDS - 1)), payload.record]);
+        } else if (payload.type === "aggregate") {
+          const aggregate = payload as TelemetryAggregate;
+          setSummary(aggregate.summary);
+          if (aggregate.series.length > 0) {
+            setRecords((prev) => [...prev, ...aggregate.series].slice(-MAX_RECORDS));
+          }
         }
       } catch (err) {
         console.error("Failed to parse websocket message", err);
@@ -52,7 +76,7 @@ export const useTelemetryStream = () => {
     ws.onclose = () => {
       setTimeout(connect, 2000);
     };
-  }, []);
+  }, [mode, rateHz, sampleRate]);
 
   useEffect(() => {
     connect();
@@ -61,5 +85,5 @@ export const useTelemetryStream = () => {
     };
   }, [connect]);
 
-  return records;
+  return { records, summary };
 };
@@ -41,4 +41,24 @@ export type SummaryBucket = Record<MetricKey, SummaryMetric>;
 export interface MetricsSummary {
   overall: SummaryBucket;
   by_backend: Record<string, SummaryBucket>;
+  counters?: Record<string, Record<string, number>>;
+}
+
+export type TelemetryMode = "raw" | "sampled" | "aggregate";
+
+export interface BackendDelta {
+  count: number;
+  avg: number;
+  p50: number;
+  p95: number;
+  max: number;
+}
+
+export interface TelemetryAggregate {
+  type: "aggregate";
+  ts: number;
+  interval_s: number;
+  by_backend: Record<string, BackendDelta>;
+  series: TelemetryRecord[];
+  summary: MetricsSummary;
 }
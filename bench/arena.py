@@ -0,0 +1,443 @@
+"""Round-robin arena measuring playing strength per millisecond of backend time.
+
+Usage:
+    python -m bench.arena --agents greedy:cpu,greedy:gpu,mcts:cpu,mcts:gpu --budgets-ms 100,400,1600
+    python -m bench.arena --agents greedy:tpu,mcts:tpu --nodes 32 --openings 16 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "apps" / "server"))
+
+from app.adapters.base import PolicyValueModel  # type: ignore  # noqa: E402
+from app.core.game import GameState  # type: ignore  # noqa: E402
+from app.core.registry import AdapterRegistry, build_simulated_models  # type: ignore  # noqa: E402
+
+console = Console()
+
+AGENT_KINDS = ("greedy", "mcts")
+
+
+@dataclass
+class MoveStats:
+    evaluations: int = 0
+    simulations: int = 0
+    think_ms: float = 0.0
+
+
+@dataclass
+class _Node:
+    prior: float
+    visits: int = 0
+    value_sum: float = 0.0
+    children: Dict[int, "_Node"] = field(default_factory=dict)
+
+    def q(self) -> float:
+        return self.value_sum / self.visits if self.visits else 0.0
+
+
+class GreedyAgent:
+    """Plays the highest-probability legal move from a single inference."""
+
+    def __init__(self, model: PolicyValueModel) -> None:
+        self._model = model
+
+    def choose(self, state: GameState) -> Tuple[int, MoveStats]:
+        result = self._model.infer(state)
+        legal = state.legal_moves()
+        column = legal[int(np.argmax([result.policy[idx] for idx in legal]))]
+        return column, MoveStats(evaluations=1, think_ms=result.latency_ms)
+
+
+class MctsAgent:
+    """PUCT search using the backend's policy as priors and its value at the leaves.
+
+    The search stops once it has spent ``budget_ms`` of backend latency (as reported by the
+    adapter, so virtual time under simulation) or ``nodes`` evaluations, whichever is set,
+    but always evaluates the root. With a budget that only covers the root it plays like
+    ``GreedyAgent``; faster backends fit more evaluations into the same budget. Simulations
+    ending in a decided position cost no backend time, so they are capped separately.
+    """
+
+    max_simulations = 512
+
+    def __init__(
+        self,
+        model: PolicyValueModel,
+        budget_ms: Optional[float] = None,
+        nodes: Optional[int] = None,
+        c_puct: float = 1.5,
+    ) -> None:
+        if budget_ms is None and nodes is None:
+            raise ValueError("MctsAgent needs a time or node budget")
+        self._model = model
+        self._budget_ms = budget_ms
+        self._nodes = nodes
+        self._c_puct = c_puct
+
+    def choose(self, state: GameState) -> Tuple[int, MoveStats]:
+        stats = MoveStats()
+        root = _Node(prior=1.0)
+        self._expand(root, state, stats)
+        while not self._exhausted(stats):
+            self._simulate(root, state.clone(), stats)
+        if all(child.visits == 0 for child in root.children.values()):
+            return max(root.children, key=lambda col: root.children[col].prior), stats
+        return max(root.children, key=lambda col: root.children[col].visits), stats
+
+    def _exhausted(self, stats: MoveStats) -> bool:
+        if stats.simulations >= self.max_simulations:
+            return True
+        if self._nodes is not None and stats.evaluations >= self._nodes:
+            return True
+        return self._budget_ms is not None and stats.think_ms >= self._budget_ms
+
+    def _expand(self, node: _Node, state: GameState, stats: MoveStats) -> float:
+        result = self._model.infer(state)
+        stats.evaluations += 1
+        stats.think_ms += result.latency_ms
+        legal = state.legal_moves()
+        total = sum(result.policy[col] for col in legal) or 1.0
+        node.children = {col: _Node(prior=result.policy[col] / total) for col in legal}
+        # Adapters report value from player 1's point of view; search wants side to move.
+        return result.value * state.current_player
+
+    def _simulate(self, root: _Node, state: GameState, stats: MoveStats) -> None:
+        stats.simulations += 1
+        path = [root]
+        node = root
+        while node.children:
+            parent_visits = math.sqrt(node.visits + 1)
+            column, node = max(
+                node.children.items(),
+                key=lambda item: -item[1].q()
+                + self._c_puct * item[1].prior * parent_visits / (1 + item[1].visits),
+            )
+            state.drop_disc(column)
+            path.append(node)
+            if state.winner() is not None or not state.legal_moves():
+                break
+        if state.winner() is not None:
+            value = -1.0  # the player who just moved won
+        elif not state.legal_moves():
+            value = 0.0
+        else:
+            value = self._expand(node, state, stats)
+        for visited in reversed(path):
+            visited.visits += 1
+            visited.value_sum += value
+            value = -value
+
+
+@dataclass
+class MatchTask:
+    first: str
+    second: str
+    opening: Tuple[int, ...]
+    seed: int
+    budget_ms: Optional[float]
+    nodes: Optional[int]
+    real_time: bool
+
+
+@dataclass
+class MatchResult:
+    first: str
+    second: str
+    opening: str
+    budget_ms: float
+    score: float
+    moves: int
+    first_evals: int
+    second_evals: int
+    first_think_ms: float
+    second_think_ms: float
+
+
+def parse_agent(spec: str) -> Tuple[str, str]:
+    kind, _, backend = spec.partition(":")
+    if kind not in AGENT_KINDS or not backend:
+        kinds = "|".join(AGENT_KINDS)
+        raise ValueError(f"Agent spec must look like '<{kinds}>:<backend>', got '{spec}'")
+    return kind, backend
+
+
+def build_agent(spec: str, models: Dict[str, PolicyValueModel], task: MatchTask):
+    kind, backend = parse_agent(spec)
+    model = models[backend]
+    if kind == "greedy":
+        return GreedyAgent(model)
+    return MctsAgent(model, budget_ms=task.budget_ms, nodes=task.nodes)
+
+
+def generate_openings(count: int, plies: int, seed: int) -> List[Tuple[int, ...]]:
+    """Distinct random move prefixes that neither end the game nor leave a win on the board."""
+    rng = np.random.default_rng(seed)
+    openings: List[Tuple[int, ...]] = []
+    seen = set()
+    attempts = 0
+    while len(openings) < count and attempts < count * 100:
+        attempts += 1
+        state = GameState()
+        moves: List[int] = []
+        for _ in range(plies):
+            column = int(rng.choice(state.legal_moves()))
+            state.drop_disc(column)
+            moves.append(column)
+        if state.winner() is not None or tuple(moves) in seen:
+            continue
+        seen.add(tuple(moves))
+        openings.append(tuple(moves))
+    return openings
+
+
+def play_match(task: MatchTask) -> MatchResult:
+    if task.real_time:
+        registry = AdapterRegistry()
+        models = {key: registry.get(key) for key in registry.available()}
+    else:
+        models = build_simulated_models(seed=task.seed)
+    first = build_agent(task.first, models, task)
+    second = build_agent(task.second, models, task)
+    state = GameState()
+    for column in task.opening:
+        state.drop_disc(column)
+    # The first agent plays whichever colour is to move once the opening has been applied.
+    first_colour = state.current_player
+    agents = (first, second)
+    totals = (MoveStats(), MoveStats())
+    moves = 0
+    while state.winner() is None and state.legal_moves():
+        column, stats = agents[moves % 2].choose(state)
+        state.drop_disc(column)
+        totals[moves % 2].evaluations += stats.evaluations
+        totals[moves % 2].think_ms += stats.think_ms
+        moves += 1
+    winner = state.winner()
+    score = 0.5 if winner is None else float(winner == first_colour)
+    return MatchResult(
+        first=task.first,
+        second=task.second,
+        opening="".join(str(col) for col in task.opening),
+        budget_ms=task.budget_ms if task.budget_ms is not None else float("nan"),
+        score=score,
+        moves=moves,
+        first_evals=totals[0].evaluations,
+        second_evals=totals[1].evaluations,
+        first_think_ms=totals[0].think_ms,
+        second_think_ms=totals[1].think_ms,
+    )
+
+
+def fit_elo(
+    results: Sequence[MatchResult], agents: Sequence[str], iterations: int = 200
+) -> np.ndarray:
+    """Bradley-Terry ratings on the Elo scale (mean zero), draws counted as half a win.
+
+    Every pair gets one virtual draw so that unbeaten or winless agents stay finite.
+    """
+    index = {agent: i for i, agent in enumerate(agents)}
+    n = len(agents)
+    wins = np.full((n, n), 0.5)
+    games = np.ones((n, n))
+    np.fill_diagonal(wins, 0.0)
+    np.fill_diagonal(games, 0.0)
+    for result in results:
+        a, b = index[result.first], index[result.second]
+        wins[a, b] += result.score
+        wins[b, a] += 1.0 - result.score
+        games[a, b] += 1.0
+        games[b, a] += 1.0
+    strength = np.ones(n)
+    for _ in range(iterations):
+        denom = (games / (strength[:, None] + strength[None, :])).sum(axis=1)
+        strength = wins.sum(axis=1) / denom
+        strength /= np.exp(np.mean(np.log(strength)))
+    return 400.0 * np.log10(strength)
+
+
+def bootstrap_elo(
+    results: Sequence[MatchResult], agents: Sequence[str], samples: int, seed: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    draws = []
+    for _ in range(samples):
+        resampled = [results[i] for i in rng.integers(len(results), size=len(results))]
+        draws.append(fit_elo(resampled, agents))
+    return np.percentile(draws, 2.5, axis=0), np.percentile(draws, 97.5, axis=0)
+
+
+def score_by_agent(results: Sequence[MatchResult], agents: Sequence[str]) -> Dict[str, float]:
+    points = {agent: 0.0 for agent in agents}
+    played = {agent: 0 for agent in agents}
+    for result in results:
+        points[result.first] += result.score
+        points[result.second] += 1.0 - result.score
+        played[result.first] += 1
+        played[result.second] += 1
+    return {agent: points[agent] / played[agent] if played[agent] else 0.0 for agent in agents}
+
+
+def build_tasks(
+    agents: Sequence[str],
+    openings: Sequence[Tuple[int, ...]],
+    budget_ms: Optional[float],
+    nodes: Optional[int],
+    seed: int,
+    real_time: bool,
+) -> List[MatchTask]:
+    tasks: List[MatchTask] = []
+    pairs = itertools.combinations(agents, 2)
+    for pair_index, (a, b) in enumerate(pairs):
+        for opening_index, opening in enumerate(openings):
+            # Each opening is played with both colour assignments.
+            for swap, (first, second) in enumerate(((a, b), (b, a))):
+                game_seed = seed * 1_000_003 + pair_index * 10_007 + opening_index * 2 + swap
+                tasks.append(
+                    MatchTask(first, second, opening, game_seed, budget_ms, nodes, real_time)
+                )
+    return tasks
+
+
+def run_arena(
+    agents: Sequence[str],
+    budgets_ms: Sequence[Optional[float]],
+    nodes: Optional[int],
+    openings: int,
+    opening_plies: int,
+    workers: int,
+    seed: int,
+    bootstrap: int,
+    real_time: bool,
+    output: Path,
+) -> Path:
+    for agent in agents:
+        parse_agent(agent)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    opening_set = generate_openings(openings, opening_plies, seed)
+    all_results: List[MatchResult] = []
+    scores: Dict[Optional[float], Dict[str, float]] = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for budget in budgets_ms:
+            tasks = build_tasks(agents, opening_set, budget, nodes, seed, real_time)
+            start = time.perf_counter()
+            chunksize = max(1, len(tasks) // (workers * 4))
+            results = list(pool.map(play_match, tasks, chunksize=chunksize))
+            elapsed = time.perf_counter() - start
+            all_results.extend(results)
+            scores[budget] = score_by_agent(results, agents)
+
+            elo = fit_elo(results, agents)
+            low, high = bootstrap_elo(results, agents, bootstrap, seed)
+            label = f"{budget:g} ms/move" if budget is not None else f"{nodes} nodes/move"
+            rate = len(results) / elapsed
+            table = Table(title=f"Arena @ {label}: {len(results)} games, {rate:.1f} games/s")
+            table.add_column("Agent", justify="left", style="bold cyan")
+            table.add_column("Elo", justify="right", style="bold white")
+            table.add_column("95% CI", justify="right")
+            table.add_column("Score", justify="right")
+            for i in np.argsort(-elo):
+                agent = agents[i]
+                table.add_row(
+                    agent,
+                    f"{elo[i]:+.0f}",
+                    f"[{low[i]:+.0f}, {high[i]:+.0f}]",
+                    f"{scores[budget][agent]:.1%}",
+                )
+            console.print(table)
+
+    if len(budgets_ms) > 1:
+        curve = Table(title="Score vs per-move time budget")
+        curve.add_column("Agent", justify="left", style="bold cyan")
+        for budget in budgets_ms:
+            curve.add_column(f"{budget:g} ms", justify="right")
+        for agent in agents:
+            curve.add_row(agent, *[f"{scores[budget][agent]:.1%}" for budget in budgets_ms])
+        console.print(curve)
+
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    pd.DataFrame([r.__dict__ for r in all_results]).to_csv(output, index=False)
+    return output
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Round-robin strength arena for AI Game Benchmark")
+    parser.add_argument(
+        "--agents",
+        default="greedy:cpu,greedy:gpu,greedy:tpu,mcts:cpu,mcts:gpu,mcts:tpu",
+        help="Comma-separated <greedy|mcts>:<backend> specs",
+    )
+    parser.add_argument(
+        "--budgets-ms",
+        default="200,800",
+        help="Comma-separated per-move backend-time budgets for search agents",
+    )
+    parser.add_argument("--nodes", type=int, default=None, help="Node budget instead of time")
+    parser.add_argument("--openings", type=int, default=8, help="Seeded openings per pairing")
+    parser.add_argument("--opening-plies", type=int, default=2, help="Random plies per opening")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for openings and backends")
+    parser.add_argument("--bootstrap", type=int, default=200, help="Bootstrap resamples for CIs")
+    parser.add_argument(
+        "--real-time",
+        action="store_true",
+        help="Use the real-time adapters (sleeping) instead of the virtual-clock simulation",
+    )
+    parser.add_argument(
+        "--out",
+        type=Path,
+        default=Path("bench/logs") / f"arena-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.csv",
+        help="Output CSV path (one row per game)",
+    )
+    return parser
+
+
+def main() -> None:
+    args = build_arg_parser().parse_args()
+    agents = [spec.strip() for spec in args.agents.split(",") if spec.strip()]
+    budgets: List[Optional[float]] = [None]
+    if args.nodes is None:
+        budgets = [float(budget) for budget in args.budgets_ms.split(",") if budget.strip()]
+    console.print(
+        f"[bold]Running arena[/bold] agents={','.join(agents)} "
+        f"openings={args.openings} workers={args.workers}"
+    )
+    try:
+        output = run_arena(
+            agents,
+            budgets,
+            args.nodes,
+            args.openings,
+            args.opening_plies,
+            args.workers,
+            args.seed,
+            args.bootstrap,
+            args.real_time,
+            args.out,
+        )
+    except ValueError as exc:
+        console.print(f"[bold red]{exc}[/bold red]")
+        raise SystemExit(2) from exc
+    console.print(f"[bold green]Games written:[/bold green] {output}")
+
+
+if __name__ == "__main__":
+    main()
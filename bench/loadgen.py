@@ -2,31 +2,40 @@
 
 Usage:
     python -m bench.loadgen --backend gpu --games 50 --out bench/logs/run.csv
+    python -m bench.loadgen --backend gpu --games 5000 --simulate --seed 7
+    python -m bench.loadgen --replay bench/logs/trace.ndjson --speed 10
+    python -m bench.loadgen --self-play --games 10000
 """
 
 from __future__ import annotations
 
 import argparse
 import asyncio
+import os
 import sys
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import httpx
 import numpy as np
 from rich.console import Console
 from rich.table import Table
-from tenacity import retry, stop_after_attempt, wait_fixed
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT / "apps" / "server"))
 
+from app.core.batch import GameBatch  # type: ignore  # noqa: E402
 from app.core.game import GameState  # type: ignore  # noqa: E402
+from app.telemetry.trace import read_trace  # type: ignore  # noqa: E402
 
 console = Console()
 
+SHED_STATUSES = (429, 503)
+
 
 @dataclass
 class LoadgenResult:
@@ -36,6 +45,22 @@ class LoadgenResult:
     game_index: int
     fanout: float
     value: float
+    status: int = 200
+
+
+@dataclass
+class ReplayResult:
+    backend: str
+    offset_s: float
+    status: int
+    original_status: int
+    latency_ms: float
+    original_latency_ms: float
+    queue_ms: float
+    original_queue_ms: float
+    total_ms: float
+    original_total_ms: float
+    client_ms: float
 
 
 def choose_column(policy: List[float], state: GameState) -> int:
@@ -46,28 +71,60 @@ def choose_column(policy: List[float], state: GameState) -> int:
     return legal[int(np.argmax(scores))]
 
 
-@retry(wait=wait_fixed(1.0), stop=stop_after_attempt(3))
-async def infer_once(client: httpx.AsyncClient, state: GameState, backend: str) -> dict:
+# Only transport failures are retried. A 429/503 from admission control is the server shedding
+# load, so it is returned to the caller and recorded, never re-sent.
+@retry(
+    wait=wait_fixed(1.0),
+    stop=stop_after_attempt(3),
+    retry=retry_if_exception_type(httpx.TransportError),
+    reraise=True,
+)
+async def infer_once(
+    client: httpx.AsyncClient, state: GameState, backend: str, deadline_ms: Optional[float] = None
+) -> dict:
     response = await client.post(
         "/infer",
         json={
             "board": state.board.tolist(),
             "current_player": state.current_player,
             "backend": backend,
+            "deadline_ms": deadline_ms,
         },
         timeout=30.0,
     )
+    if response.status_code in SHED_STATUSES:
+        return {"status": response.status_code}
     response.raise_for_status()
     return response.json()
 
 
-async def play_game(client: httpx.AsyncClient, backend: str, game_index: int, max_moves: int) -> List[LoadgenResult]:
+async def play_game(
+    client: httpx.AsyncClient,
+    backend: str,
+    game_index: int,
+    max_moves: int,
+    deadline_ms: Optional[float] = None,
+) -> List[LoadgenResult]:
     state = GameState()
     results: List[LoadgenResult] = []
     for move in range(max_moves):
         if not state.legal_moves():
             break
-        payload = await infer_once(client, state, backend)
+        payload = await infer_once(client, state, backend, deadline_ms)
+        if "status" in payload:
+            # A shed move ends the game: the client gives up instead of adding load.
+            results.append(
+                LoadgenResult(
+                    backend=backend,
+                    latency_ms=float("nan"),
+                    move_index=move,
+                    game_index=game_index,
+                    fanout=float("nan"),
+                    value=float("nan"),
+                    status=payload["status"],
+                )
+            )
+            break
         column = choose_column(payload["policy"], state)
         state.drop_disc(column)
         results.append(
@@ -85,14 +142,44 @@ async def play_game(client: httpx.AsyncClient, backend: str, game_index: int, ma
     return results
 
 
-async def run_loadgen(backend: str, games: int, concurrency: int, max_moves: int, output: Path) -> Path:
+def configure_simulation(seed: int, profile: Optional[Path]) -> None:
+    """Switch the in-process server to virtual-clock adapters. Must run before importing app.api."""
+    os.environ["AIGB_SIMULATION_MODE"] = "true"
+    os.environ["AIGB_SIMULATION_SEED"] = str(seed)
+    if profile is not None:
+        os.environ["AIGB_SIMULATION_PROFILE"] = str(profile)
+
+
+def build_client(simulate: bool) -> httpx.AsyncClient:
+    if not simulate:
+        return httpx.AsyncClient(base_url="http://localhost:8000")
+    from app.api import app  # type: ignore  # pylint: disable=import-outside-toplevel
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://simulated")
+
+
+def simulated_seconds() -> float:
+    from app.core.registry import registry  # type: ignore  # pylint: disable=import-outside-toplevel
+
+    return registry.get("cpu").clock.advanced
+
+
+async def run_loadgen(
+    backend: str,
+    games: int,
+    concurrency: int,
+    max_moves: int,
+    output: Path,
+    deadline_ms: Optional[float] = None,
+    simulate: bool = False,
+) -> Path:
     output.parent.mkdir(parents=True, exist_ok=True)
-    async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
+    async with build_client(simulate) as client:
         semaphore = asyncio.Semaphore(concurrency)
 
         async def wrapped_game(index: int) -> List[LoadgenResult]:
             async with semaphore:
-                return await play_game(client, backend, index, max_moves)
+                return await play_game(client, backend, index, max_moves, deadline_ms)
 
         tasks = [asyncio.create_task(wrapped_game(i)) for i in range(games)]
         results_nested = await asyncio.gather(*tasks)
@@ -118,17 +205,203 @@ async def run_loadgen(backend: str, games: int, concurrency: int, max_moves: int
     table.add_row("avg latency", f"{df.latency_ms.mean():.2f} ms")
     table.add_row("avg fanout", f"{df.fanout.mean():.1f}")
     table.add_row("avg value", f"{df.value.mean():.3f}")
+    table.add_row("shed (429/503)", f"{(df.status != 200).mean():.1%}")
+    if simulate:
+        table.add_row("simulated backend time", f"{simulated_seconds():.1f} s")
+
+    console.print(table)
+    return output
+
+
+async def replay_request(client: httpx.AsyncClient, entry: dict, offset_s: float) -> ReplayResult:
+    # No retries here: a replay should reproduce the recorded load, not amplify it.
+    state: GameState = entry["game"]
+    start = time.perf_counter()
+    response = await client.post(
+        "/infer",
+        json={
+            "board": state.board.tolist(),
+            "current_player": state.current_player,
+            "backend": entry["backend"],
+            "deadline_ms": entry.get("deadline_ms"),
+        },
+        timeout=30.0,
+    )
+    client_ms = (time.perf_counter() - start) * 1000.0
+    latency_ms = queue_ms = float("nan")
+    if response.status_code == 200:
+        body = response.json()
+        latency_ms = float(body["latency_ms"])
+        queue_ms = float(body["extras"].get("queue_ms", 0.0))
+    original_latency_ms = original_queue_ms = float("nan")
+    if entry.get("status", 200) == 200:
+        original_latency_ms = float(entry["latency_ms"])
+        original_queue_ms = float(entry.get("queue_ms", 0.0))
+    return ReplayResult(
+        backend=entry["backend"],
+        offset_s=offset_s,
+        status=response.status_code,
+        original_status=int(entry.get("status", 200)),
+        latency_ms=latency_ms,
+        original_latency_ms=original_latency_ms,
+        queue_ms=queue_ms,
+        original_queue_ms=original_queue_ms,
+        total_ms=queue_ms + latency_ms,
+        original_total_ms=original_queue_ms + original_latency_ms,
+        client_ms=client_ms,
+    )
+
+
+async def run_replay(
+    trace: Path, speed: Optional[float], concurrency: int, output: Path, simulate: bool = False
+) -> Path:
+    """Re-issue a captured trace at ``speed``x its recorded pacing, or back to back when ``None``.
+
+    Timed replays are open-loop: requests fire on schedule whether or not earlier ones have
+    returned. Only the as-fast-as-possible mode is bounded by ``concurrency``.
+    """
+    entries = list(read_trace(trace))
+    if not entries:
+        console.print(f"[bold red]Trace {trace} is empty.[/bold red]")
+        return output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    origin = entries[0]["t"]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with build_client(simulate) as client:
+        start = time.perf_counter()
+
+        async def fire(entry: dict) -> ReplayResult:
+            offset = entry["t"] - origin
+            if speed is not None:
+                await asyncio.sleep(max(0.0, offset / speed - (time.perf_counter() - start)))
+                return await replay_request(client, entry, offset)
+            async with semaphore:
+                return await replay_request(client, entry, offset)
+
+        results = await asyncio.gather(*(fire(entry) for entry in entries))
+        elapsed = time.perf_counter() - start
 
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    df = pd.DataFrame([r.__dict__ for r in results])
+    df.to_csv(output, index=False)
+
+    pace = "max" if speed is None else f"{speed:g}x"
+    recorded = entries[-1]["t"] - origin
+    table = Table(
+        title=f"Replay of {len(df):,} requests at {pace} "
+        f"({recorded:.1f} s recorded, {elapsed:.1f} s replayed)"
+    )
+    table.add_column("Backend", justify="left", style="bold cyan")
+    table.add_column("Metric", justify="left")
+    table.add_column("Original", justify="right")
+    table.add_column("Replay", justify="right", style="bold white")
+    table.add_column("Delta", justify="right")
+    # Server-side total (queue + model) is where load shows up; model time alone barely moves.
+    metrics = (("total", "total_ms"), ("queue", "queue_ms"), ("model", "latency_ms"))
+    quantiles = (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+    groups = [("all", df), *sorted(df.groupby("backend"), key=lambda item: item[0])]
+    for name, group in groups:
+        for metric, column in metrics:
+            for label, quantile in quantiles:
+                before = group[f"original_{column}"].quantile(quantile)
+                after = group[column].quantile(quantile)
+                # Queue time often starts near zero, where a relative change is meaningless.
+                if metric == "queue":
+                    delta = f"{after - before:+.2f} ms"
+                else:
+                    delta = f"{(after - before) / before:+.1%}" if before > 0 else "n/a"
+                table.add_row(
+                    name, f"{label} {metric}", f"{before:.2f} ms", f"{after:.2f} ms", delta
+                )
+        # The trace has no client-side timing, so there is nothing to diff against.
+        for label, quantile in quantiles:
+            after = group.client_ms.quantile(quantile)
+            table.add_row(name, f"{label} client", "-", f"{after:.2f} ms", "")
+        before = (group.original_status != 200).mean()
+        after = (group.status != 200).mean()
+        table.add_row(name, "rejected", f"{before:.1%}", f"{after:.1%}", f"{after - before:+.1%}")
     console.print(table)
     return output
 
 
+def run_batched_self_play(games: int, seed: int) -> None:
+    """Play ``games`` uniformly random games in one ``GameBatch`` to gauge raw engine throughput."""
+    rng = np.random.default_rng(seed)
+    batch = GameBatch(games)
+    outcomes = {1: 0, -1: 0, 0: 0}
+    plies = positions = 0
+    start = time.perf_counter()
+    while len(batch):
+        legal = batch.legal_mask()
+        scores = rng.random(legal.shape)
+        scores[~legal] = -1.0
+        batch.drop_discs(scores.argmax(axis=1))
+        batch.encode_planes()
+        positions += len(batch)
+        plies += 1
+        _, winners = batch.compact()
+        for winner, count in zip(*np.unique(winners, return_counts=True)):
+            outcomes[int(winner)] += int(count)
+    elapsed = time.perf_counter() - start
+
+    table = Table(title=f"Batched self-play of {games:,} random games")
+    table.add_column("Metric", justify="left", style="bold cyan")
+    table.add_column("Value", justify="right", style="bold white")
+    table.add_row("plies", f"{plies}")
+    table.add_row("positions", f"{positions:,}")
+    table.add_row("elapsed", f"{elapsed:.2f} s")
+    table.add_row("games/s", f"{games / elapsed:,.0f}")
+    table.add_row("positions/s", f"{positions / elapsed:,.0f}")
+    table.add_row("first / second / draw", f"{outcomes[1]} / {outcomes[-1]} / {outcomes[0]}")
+    console.print(table)
+
+
+def parse_speed(value: str) -> Optional[float]:
+    if value == "max":
+        return None
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("--speed must be positive or 'max'")
+    return speed
+
+
 def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Load generator for AI Game Benchmark")
     parser.add_argument("--backend", default="cpu", help="Backend key (cpu, gpu, tpu)")
     parser.add_argument("--games", type=int, default=20, help="Number of games to simulate")
     parser.add_argument("--concurrency", type=int, default=4, help="Concurrent games in flight")
     parser.add_argument("--max-moves", type=int, default=42, help="Max moves per game")
+    parser.add_argument(
+        "--deadline-ms", type=float, default=None, help="Per-request deadline forwarded to /infer"
+    )
+    parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help="Run the server in-process on virtual-clock adapters instead of calling localhost:8000",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Per-backend RNG seed for --simulate")
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        help="Latency profile for --simulate: recorded telemetry.ndjson or parametric JSON",
+    )
+    parser.add_argument(
+        "--self-play",
+        action="store_true",
+        help="Play --games random games in-process on the vectorized engine; no server involved",
+    )
+    parser.add_argument(
+        "--replay", type=Path, default=None, help="Replay a trace captured with AIGB_TRACE_PATH"
+    )
+    parser.add_argument(
+        "--speed",
+        type=parse_speed,
+        default=1.0,
+        help="Replay pacing: 1 for recorded timing, N for N-times compressed, 'max' for no gaps",
+    )
     parser.add_argument(
         "--out",
         type=Path,
@@ -140,11 +413,36 @@ def build_arg_parser() -> argparse.ArgumentParser:
 
 def main() -> None:
     args = build_arg_parser().parse_args()
+    if args.self_play:
+        run_batched_self_play(args.games, args.seed)
+        return
+    if args.simulate:
+        configure_simulation(args.seed, args.profile)
+    if args.replay is not None:
+        console.print(f"[bold]Replaying trace[/bold] {args.replay} speed={args.speed or 'max'}")
+        try:
+            asyncio.run(
+                run_replay(args.replay, args.speed, args.concurrency, args.out, args.simulate)
+            )
+        except httpx.HTTPError as exc:
+            console.print(f"[bold red]HTTP error during replay: {exc}[/bold red]")
+            raise SystemExit(1) from exc
+        return
     console.print(
         f"[bold]Running loadgen[/bold] backend={args.backend} games={args.games} concurrency={args.concurrency}"
     )
     try:
-        asyncio.run(run_loadgen(args.backend, args.games, args.concurrency, args.max_moves, args.out))
+        asyncio.run(
+            run_loadgen(
+                args.backend,
+                args.games,
+                args.concurrency,
+                args.max_moves,
+                args.out,
+                args.deadline_ms,
+                args.simulate,
+            )
+        )
     except httpx.HTTPError as exc:
         console.print(f"[bold red]HTTP error during load generation: {exc}[/bold red]")
         raise SystemExit(1) from exc